@@ -0,0 +1,202 @@
+import glob
+import os
+import re
+import sys
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+import utils
+import utils_code
+import utils_manifest
+
+LOGGER = utils.set_logger()
+
+# 생활이동 원본 column → 분석용 column
+LM_RAW_COLUMNS = {
+    "도착시간": "hour",
+    "출발 행정동 코드": "origin",
+    "도착 행정동 코드": "destination",
+    "나이": "age",
+    "이동인구(합)": "pop",
+}
+# 이동인구가 적으면 "*"로 표시되므로, 이동인구는 문자열로 읽은 뒤 숫자로 바꾼다
+LM_RAW_DTYPES = {
+    "도착시간": "int8",
+    "출발 행정동 코드": "int32",
+    "도착 행정동 코드": "int32",
+    "나이": "int16",
+    "이동인구(합)": "str",
+}
+LM_ENCODING = "cp949"
+# 청년 연령대 (나이 column은 5세 단위 연령대의 시작 나이)
+LM_YOUTH_AGES = (20, 25, 30)
+# 생활이동 원본 CSV를 한 번에 읽어 들일 row 수
+LM_CHUNK_SIZE = 1_000_000
+# 시간대 개수
+NUM_HOURS = 24
+
+
+def read_living_migration_raw(file_path_list, chunksize=None):
+    """생활이동 원본 CSV 파일들(경로 또는 파일 객체)에서 필요한 column만 골라 chunk 단위로 읽기"""
+    chunksize = LM_CHUNK_SIZE if chunksize is None else chunksize
+    for file_path in file_path_list:
+        reader = pd.read_csv(
+            file_path,
+            usecols=list(LM_RAW_COLUMNS),
+            dtype=LM_RAW_DTYPES,
+            encoding=LM_ENCODING,
+            chunksize=chunksize,
+        )
+        for chunk in reader:
+            chunk = chunk[list(LM_RAW_COLUMNS)]
+            chunk.columns = list(LM_RAW_COLUMNS.values())
+            yield chunk
+
+
+def to_latest_dong_code(codes):
+    """생활이동의 7자리 (통계청) 행정동 코드를 8자리 문자열 코드로 바꾸기"""
+    codes = codes.to_numpy()
+    codes = np.where(codes < 10_000_000, codes * 10, codes)
+    return pd.Series(codes, dtype="int64").astype(str).to_numpy()
+
+
+def build_od_matrix(chunks, dong_codes):
+    """생활이동 chunk들을 누적하여, 시간대별 청년 이동인구 OD 행렬 만들기
+
+    Returns:
+        (24 * 행정동 수) × 행정동 수 크기의 sparse 행렬 (CSR)
+        h시 slice는 [h * 행정동 수 : (h + 1) * 행정동 수] 행이다.
+    """
+    n = len(dong_codes)
+    od = sparse.csr_matrix((NUM_HOURS * n, n), dtype=np.float32)
+    num_rows = 0
+    for chunk in chunks:
+        num_rows += len(chunk)
+        utils.add_metric("rows_in", len(chunk))
+        chunk = chunk[chunk["age"].isin(LM_YOUTH_AGES)].copy()
+        chunk["pop"] = pd.to_numeric(chunk["pop"], errors="coerce").fillna(0)
+        chunk["pop"] = chunk["pop"].astype("float32")
+
+        # 과거 행정동 코드를 최신 행정동 코드로 변경 (분할된 행정동은 이동인구를 나눔)
+        for column in ("origin", "destination"):
+            chunk[column] = to_latest_dong_code(chunk[column])
+            chunk = utils_code.remap_dong_code(chunk, ["pop"], code_column=column)
+
+        # 서울시 행정동끼리의 이동만 남기기
+        origin = pd.Categorical(chunk["origin"], categories=dong_codes).codes
+        destination = pd.Categorical(chunk["destination"], categories=dong_codes).codes
+        inside = (origin >= 0) & (destination >= 0)
+        hour = chunk["hour"].to_numpy()[inside].astype(np.int64)
+
+        coo = sparse.coo_matrix(
+            (
+                chunk["pop"].to_numpy()[inside],
+                (hour * n + origin[inside], destination[inside]),
+            ),
+            shape=od.shape,
+            dtype=np.float32,
+        )
+        od = od + coo.tocsr()
+        LOGGER.info(f"데이터 처리 중 - {num_rows:,} rows")
+    od.sum_duplicates()
+    return od
+
+
+def get_od_matrix_path(year_month):
+    """청년 이동인구 OD 행렬 파일 경로 가져오기"""
+    return utils.check_path("생활이동", f"생활이동_분석_청년_OD_{year_month}.npz")
+
+
+def save_od_matrix(file_path, od, dong_codes):
+    """OD 행렬과 행정동 코드 목록을 npz 파일 1개로 저장하기"""
+    np.savez_compressed(
+        file_path,
+        data=od.data,
+        indices=od.indices,
+        indptr=od.indptr,
+        shape=np.array(od.shape),
+        dong_codes=np.array(dong_codes),
+    )
+
+
+def load_od_matrix(year_month):
+    """저장된 청년 이동인구 OD 행렬 불러오기
+
+    Returns:
+        (OD 행렬 (CSR), 행정동 코드 리스트)
+    """
+    file_path = get_od_matrix_path(year_month)
+    if not os.path.isfile(file_path):
+        raise Exception(f'파일 없음: "{file_path}"')
+    with np.load(file_path) as npz:
+        od = sparse.csr_matrix(
+            (npz["data"], npz["indices"], npz["indptr"]), shape=tuple(npz["shape"])
+        )
+        dong_codes = npz["dong_codes"].tolist()
+    return od, dong_codes
+
+
+def get_od_by_hour(od, dong_codes, hours=None):
+    """OD 행렬에서 특정 시간대(들)의 행정동 × 행정동 이동인구 합 구하기 (없으면 하루 전체)"""
+    n = len(dong_codes)
+    hours = range(NUM_HOURS) if hours is None else hours
+    hours = [hours] if isinstance(hours, int) else hours
+    result = sparse.csr_matrix((n, n), dtype=od.dtype)
+    for hour in hours:
+        result = result + od[hour * n : (hour + 1) * n]
+    return result
+
+
+@utils.instrument
+def process_living_migration_data(
+    year_months=None, force=False, chunksize=None, source="csv"
+):
+    """생활이동 데이터 전처리하기 (청년 이동인구 OD 행렬 만들기)
+
+    수집 기록(manifest)을 확인하여, 지난 처리 이후 새로 받았거나 바뀐 달의 데이터만 처리한다.
+    source="zip"이면 압축을 푼 CSV 대신, 내려받은 zip 파일에서 CSV를 바로 읽는다.
+    """
+    LOGGER.info("=============================================================")
+    LOGGER.info("데이터 처리 시작 - [ 생활이동 데이터 ]")
+    LOGGER.info("=============================================================")
+
+    # OD 행렬의 행, 열 순서 = 최신 행정동 코드 순서
+    dong_codes = utils_code.get_dong_codes()
+    # 행정동 코드 변경 규칙이 바뀌면 모든 달을 다시 처리
+    remap_hash = utils_code.get_remap_hash()
+
+    if source == "csv":
+        data_pattern = os.path.join(utils.check_path("생활이동"), "생활이동_데이터_*_행정동_raw")
+    elif source == "zip":
+        data_pattern = os.path.join(utils.check_path("생활이동", "zip"), "생활이동_데이터_*.zip")
+    else:
+        raise Exception(f"지원하지 않는 원본 형식: {source}")
+
+    for data_path in sorted(glob.glob(data_pattern)):
+        ym = re.search(r"생활이동_데이터_(\d{6})", data_path).group(1)
+        if year_months is not None and ym not in year_months:
+            continue
+        if not force and utils_manifest.is_processed("생활이동", ym, remap_hash):
+            LOGGER.info(f"데이터 처리 생략 (변경 없음) - 날짜: {ym}")
+            continue
+
+        if source == "zip":
+            file_path_list = (f for _, f in utils.iter_zip_members(data_path))
+        else:
+            file_path_list = sorted(
+                glob.glob(os.path.join(data_path, "**", "*.csv"), recursive=True)
+            )
+        chunks = read_living_migration_raw(file_path_list, chunksize=chunksize)
+        od = build_od_matrix(chunks, dong_codes)
+        save_od_matrix(get_od_matrix_path(ym), od, dong_codes)
+        utils.add_metric("rows_out", od.nnz)
+        utils_manifest.mark_processed("생활이동", ym, remap_hash)
+        LOGGER.info(f"데이터 처리 완료 - 생활이동 행정동 데이터 ({ym}, nnz={od.nnz:,})")
+
+
+if __name__ == "__main__":
+    import pipeline
+
+    pipeline.main(sys.argv[1:] or ["process_living_migration_data"])
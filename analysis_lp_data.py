@@ -1,23 +1,92 @@
+import datetime
 import glob
 import os
-from collections import defaultdict
+import re
+import sys
 
+import numpy as np
 import pandas as pd
 
 import utils
-import utils_vis
+import utils_cache
+import utils_manifest
+import utils_code
+import utils_store
 
 LOGGER = utils.set_logger()
 
-
+# 청년 생활인구 column
+POP_COLUMNS = [
+    "man_20_24_pop",
+    "man_25_29_pop",
+    "man_30_34_pop",
+    "woman_20_24_pop",
+    "woman_25_29_pop",
+    "woman_30_34_pop",
+]
+
+# 생활인구 원본 column → 분석용 column
+LP_RAW_COLUMNS = {
+    "기준일ID": "date",
+    "시간대구분": "time",
+    "행정동코드": "dong_code",
+    "남자20세부터24세생활인구수": "man_20_24_pop",
+    "남자25세부터29세생활인구수": "man_25_29_pop",
+    "남자30세부터34세생활인구수": "man_30_34_pop",
+    "여자20세부터24세생활인구수": "woman_20_24_pop",
+    "여자25세부터29세생활인구수": "woman_25_29_pop",
+    "여자30세부터34세생활인구수": "woman_30_34_pop",
+}
+LP_RAW_DTYPES = {
+    "기준일ID": "int32",
+    "시간대구분": pd.CategoricalDtype(range(24)),
+    "행정동코드": "int32",
+    **{k: "float32" for k in list(LP_RAW_COLUMNS)[3:]},
+}
+LP_CLEAN_COLUMNS = ["date", "time", "dong_name", "dong_code"] + POP_COLUMNS
+
+# 집계 큐브의 시간대 구간 (새벽, 오전, 오후, 밤)
+HOUR_BANDS = {
+    "dawn": range(0, 6),
+    "morning": range(6, 12),
+    "afternoon": range(12, 18),
+    "night": range(18, 24),
+}
+HOUR_BAND_CODES = np.array(
+    [i for i, hours in enumerate(HOUR_BANDS.values()) for _ in hours], dtype="int8"
+)
+# 집계 큐브 단위별 차원
+CUBE_KEYS = {
+    "dong": ["gu", "dong_code", "date", "time", "day_type", "hour_band", "sex", "age"],
+    "gu": ["gu", "date", "time", "day_type", "hour_band", "sex", "age"],
+}
+
+# 생활인구 원본 CSV를 한 번에 읽어 들일 row 수
+LP_CHUNK_SIZE = 500_000
+
+# 기간별 합계 구간 (최근 n개월)
+LP_ROLLING_WINDOWS = (1, 3, 12)
+# 월별 부분 합 형식 버전 (바뀌면 모든 달을 다시 집계)
+LP_MONTHLY_SUM_FORMAT = 2
+
+# 집계 큐브, 행정동별 합 파일 (_dataset 기준, 결과 캐시의 입력 파일)
+LP_CUBE_FILES = [
+    "생활인구/생활인구_분석_큐브_행정동.parquet",
+    "생활인구/생활인구_분석_큐브_자치구.parquet",
+]
+LP_DONG_SUM_FILE = "생활인구/생활인구_분석_행정동별_청년_생활인구_합.parquet"
+
+
+@utils.instrument
 def process_living_population_dong_code():
     """'생활인구 행정동 코드' 전처리하기
 
+    생활인구 행정동 코드와 저장된 모든 버전의 행정동 코드를 최신 행정동 코드와 대조하여
+    행정동 코드 변경 표(utils_code.get_remap_table_path())를 저장한다.
+    생활인구, 생활이동 데이터 처리 단계는 이 표로 과거 행정동 코드를 최신 코드로 바꾼다.
+
     NOTE:
-        - (과거) 강남구 일원2동(11230740) → (현재) 강남구 개포3동(11230511)
-        - (과거) 강동구 상일동(11250520) → (현재) 강동구 상일1동(11250760)
-        - (과거) 강동구 강일동(11250510) → (현재) 강동구 강일동(11250750), 강동구 상일2동(11250770)
-        - (과거) 구로구 오류2동(11170680) → (현재) 구로구 오류2동(11170730), 구로구 항동(11170740)
+        - 분할, 통합처럼 코드와 이름만으로 알 수 없는 변경은 utils_code.DONG_CODE_REMAP에 적는다.
     """
     LOGGER.info("=============================================================")
     LOGGER.info("데이터 처리 시작 - [ 생활인구 행정동 코드 ]")
@@ -26,6 +95,7 @@ def process_living_population_dong_code():
     raw_code_file_path = utils.check_path("생활인구", "생활인구_행정동_코드_raw.csv")
     df = utils.load_data(raw_code_file_path, encoding="cp949")
     df = df.drop([0])
+    utils.add_metric("rows_in", len(df))
 
     lp_name2code = {}
     lp_hcode2scode = {}
@@ -47,150 +117,260 @@ def process_living_population_dong_code():
     lp_hcode2scode = dict(sorted(lp_hcode2scode.items(), key=lambda x: x[0]))
     lp_hcode2scode_save_path = utils.check_path("생활인구", "생활인구_행정동_코드_h2s.json")
     utils.save_data(lp_hcode2scode_save_path, lp_hcode2scode)
+    utils.add_metric("rows_out", len(lp_name2code) + len(lp_hcode2scode))
     LOGGER.info("데이터 저장 완료 - (행자부) 행정동 코드 to (통계청) 행정동 코드")
 
-    # '최신 행정동 코드'와 비교
-    lp_name2code = set(lp_name2code.items())
-    latest_name2code_path = os.path.join(utils.check_path("행정동"), "행정동_코드_*")
-    latest_name2code_path = glob.glob(latest_name2code_path)[0]
-    latest_name2code = utils.load_data(latest_name2code_path)
-    latest_name2code = set(latest_name2code.items())
-    LOGGER.info(f"(최신 행정동) - (생활인구 행정동) = {latest_name2code - lp_name2code}")
-    LOGGER.info(f"(생활인구 행정동) - (최신 행정동) = {lp_name2code - latest_name2code}")
+    # '최신 행정동 코드'와 대조하여 행정동 코드 변경 표 저장
+    codes_df = utils_code.load_code_versions(extra={"생활인구": lp_name2code})
+    remap_df = utils_code.reconcile_dong_codes(codes_df)
+    remap_df = remap_df.astype(object).where(remap_df.notna(), None)
+    utils.save_data(utils_code.get_remap_table_path(), remap_df.to_dict("records"))
+    LOGGER.info("데이터 저장 완료 - 행정동 코드 변경 표")
+
+    for version, version_df in remap_df.groupby("version", sort=False):
+        counts = version_df["change"].value_counts().to_dict()
+        LOGGER.info(f"행정동 코드 대조 ({version} → 최신) - {counts}")
+    changed = remap_df[remap_df["change"] != "unchanged"]
+    changed = changed.drop_duplicates(["old_code", "new_code", "change"], keep="last")
+    for row in changed.itertuples():
+        old = "-" if row.old_code is None else f"{row.old_name}({row.old_code})"
+        new = "-" if row.new_code is None else f"{row.new_name}({row.new_code})"
+        weight = "" if row.weight in (None, 1.0) else f" (비율: {row.weight})"
+        LOGGER.info(f"[{row.change}] {old} → {new}{weight}")
+
+
+def read_living_population_raw(file_path, chunksize=None):
+    """생활인구 원본 CSV(경로 또는 파일 객체)에서 필요한 column만 골라 chunk 단위로 읽기
+
+    원본 파일은 각 줄 끝에 구분자(,)가 하나 더 붙어 있으므로 index_col=False로 읽는다.
+    """
+    chunksize = LP_CHUNK_SIZE if chunksize is None else chunksize
+    reader = pd.read_csv(
+        file_path,
+        usecols=list(LP_RAW_COLUMNS),
+        dtype=LP_RAW_DTYPES,
+        index_col=False,
+        chunksize=chunksize,
+    )
+    for chunk in reader:
+        chunk = chunk[list(LP_RAW_COLUMNS)]
+        chunk.columns = list(LP_RAW_COLUMNS.values())
+        yield chunk
+
 
+@utils.instrument
+def process_living_population_data(
+    year_months=None, force=False, chunksize=None, source="csv"
+):
+    """생활인구 데이터 전처리하기
 
-def process_living_population_data():
-    """생활인구 데이터 전처리하기"""
+    수집 기록(manifest)을 확인하여, 지난 처리 이후 새로 받았거나 바뀐 달의 데이터만 처리한다.
+    year_months(YYYYMM 리스트)로 처리할 달을 지정할 수 있고, force=True이면 모두 다시 처리한다.
+    source="zip"이면 압축을 푼 CSV 대신, 내려받은 zip 파일에서 CSV를 바로 읽는다.
+    """
     LOGGER.info("=============================================================")
     LOGGER.info("데이터 처리 시작 - [ 생활인구 데이터 ]")
     LOGGER.info("=============================================================")
 
-    data_file_path = os.path.join(utils.check_path("생활인구"), "*.csv")
-    data_file_path_list = glob.glob(data_file_path)
-    data_file_path = [f for f in data_file_path_list if "생활인구_데이터" in f][0]
-    df = utils.load_data(data_file_path)
+    if source == "csv":
+        data_file_path = os.path.join(
+            utils.check_path("생활인구"), "생활인구_데이터_*_행정동_raw.csv"
+        )
+    elif source == "zip":
+        data_file_path = os.path.join(utils.check_path("생활인구", "zip"), "생활인구_데이터_*.zip")
+    else:
+        raise Exception(f"지원하지 않는 원본 형식: {source}")
+    data_file_path_list = sorted(glob.glob(data_file_path))
+
+    # 행자부 코드 → 통계청 코드 변환, 행정동 이름 추가에 사용할 최신 버전의 행정동 코드 색인
+    version = utils_code.get_latest_code_version()
+    if len(utils_code.get_registry(version)["hcode2scode"]) == 0:
+        raise Exception(f'파일 없음: "{utils_code.get_h2s_path()}"')
+    # 행정동 코드 변경 규칙이 바뀌면 모든 달을 다시 처리
+    remap_hash = utils_code.get_remap_hash()
+
+    for data_file_path in data_file_path_list:
+        ym = "20" + re.search(r"생활인구_데이터_(\d{4})", data_file_path).group(1)
+        if year_months is not None and ym not in year_months:
+            continue
+        if not force and utils_manifest.is_processed("생활인구", ym, remap_hash):
+            LOGGER.info(f"데이터 처리 생략 (변경 없음) - 날짜: {ym}")
+            continue
+
+        data_save_path = utils.check_path("생활인구", f"생활인구_데이터_{ym[2:]}_행정동_clean.csv")
+        process_living_population_file(
+            data_file_path, data_save_path, version=version, chunksize=chunksize
+        )
+        utils_manifest.mark_processed("생활인구", ym, remap_hash)
+        LOGGER.info(f"데이터 처리 완료 - 생활인구 행정동 데이터 ({ym})")
+
+
+def process_living_population_file(
+    data_file_path, data_save_path, version=None, chunksize=None
+):
+    """생활인구 원본 파일(CSV 또는 zip) 1개를 chunk 단위로 처리하여 clean 파일과 저장소에 저장하기"""
+    if os.path.isfile(data_save_path):
+        os.remove(data_save_path)
+
+    if data_file_path.endswith(".zip"):
+        raw_files = (f for _, f in utils.iter_zip_members(data_file_path))
+    else:
+        raw_files = [data_file_path]
+    reader = (
+        chunk
+        for raw_file in raw_files
+        for chunk in read_living_population_raw(raw_file, chunksize=chunksize)
+    )
 
-    df = df.reset_index()
-    columns = df.columns
-    df = df.drop(["여자70세이상생활인구수"], axis=1)
-    df.columns = columns[1:]
+    num_rows = 0
+    cleared = set()
+    for i, df in enumerate(reader):
+        utils.add_metric("rows_in", len(df))
+        df["dong_code"] = utils_code.lookup(df["dong_code"], "hcode2scode", version)
+        df = utils_code.remap_dong_code(df, POP_COLUMNS)
+        df["dong_name"] = utils_code.lookup(df["dong_code"], "scode2name", version)
+        df = df[LP_CLEAN_COLUMNS]
 
-    # 필요한 column만 남기기
-    df = df[
-        [
-            "기준일ID",
-            "시간대구분",
-            "행정동코드",
-            "남자20세부터24세생활인구수",
-            "남자25세부터29세생활인구수",
-            "남자30세부터34세생활인구수",
-            "여자20세부터24세생활인구수",
-            "여자25세부터29세생활인구수",
-            "여자30세부터34세생활인구수",
-        ]
-    ]
+        utils.save_data(data_save_path, df, encoding="cp949", append=num_rows > 0)
 
-    # column 이름 바꾸기
-    df.columns = [
-        "date",
-        "time",
-        "dong_code",
-        "man_20_24_pop",
-        "man_25_29_pop",
-        "man_30_34_pop",
-        "woman_20_24_pop",
-        "woman_25_29_pop",
-        "woman_30_34_pop",
-    ]
+        # (년월, 자치구) 파티션 저장소에 저장 (처음 보는 년월은 기존 파티션 삭제 후 저장)
+        for year_month in (df["date"] // 100).astype(str).unique():
+            if year_month not in cleared:
+                utils_store.clear_living_population_partition(year_month)
+                cleared.add(year_month)
+        utils_store.write_living_population(df, part_name=f"part-{i:05d}")
+        utils.add_metric("rows_out", len(df))
+
+        num_rows += len(df)
+        LOGGER.info(f"데이터 처리 중 - {num_rows:,} rows")
+
+
+def get_monthly_sum_path(file_name):
+    """월별 부분 합 디렉토리의 파일 경로 가져오기"""
+    return utils.check_path("생활인구", "생활인구_분석_월별_합", file_name)
+
+
+def sum_month(year_month, engine=None):
+    """년월 파티션 하나의 행정동별 청년 생활인구 합 구하기 (float64, 행정동 순)
+
+    engine="arrow"이면 파티션을 메모리에 모두 올리지 않고 pyarrow로 나누어 읽으며 합산한다.
+    (engine과 상관없이 결과는 같다)
+    """
+    keys = ["gu", "dong_name", "dong_code"]
+    if utils.get_engine(engine) == "arrow":
+        utils.add_metric("rows_in", utils_store.count_living_population(year_month))
+        return utils_store.sum_living_population(year_month, keys, POP_COLUMNS)
+
+    df = utils_store.read_living_population(
+        start=year_month, end=year_month, columns=keys + POP_COLUMNS
+    )
+    utils.add_metric("rows_in", len(df))
+    df[POP_COLUMNS] = df[POP_COLUMNS].astype("float64")
+    return df.groupby(keys, observed=True)[POP_COLUMNS].sum().reset_index()
 
-    # 행자부 코드를 통계청 코드로 변환
-    code_h2s_path = utils.check_path("생활인구", "생활인구_행정동_코드_h2s.json")
-    code_h2s = utils.load_data(code_h2s_path)
-    df["dong_code"] = df["dong_code"].apply(str)
-    df["dong_code"] = df["dong_code"].map(code_h2s)
-
-    # 행정동 코드를 최신 행정동 코드로 변경
-    # - (과거) 강남구 일원2동(11230740) → (현재) 강남구 개포3동(11230511)
-    # - (과거) 강동구 상일동(11250520) → (현재) 강동구 상일1동(11250760)
-    # - (과거) 강동구 강일동(11250510) → (현재) 강동구 강일동(11250750), 강동구 상일2동(11250770)
-    # - (과거) 구로구 오류2동(11170680) → (현재) 구로구 오류2동(11170730), 구로구 항동(11170740)
-    new_list = []
-    for row in df.to_dict("records"):
-        if row["dong_code"] == "11230740":
-            row["dong_code"] = "11230511"
-            new_list.append(row)
-        elif row["dong_code"] == "11250520":
-            row["dong_code"] = "11250760"
-            new_list.append(row)
-        elif row["dong_code"] == "11250510":
-            row["man_20_24_pop"] = row["man_20_24_pop"] / 2
-            row["man_25_29_pop"] = row["man_25_29_pop"] / 2
-            row["man_30_34_pop"] = row["man_30_34_pop"] / 2
-            row["woman_20_24_pop"] = row["woman_20_24_pop"] / 2
-            row["woman_25_29_pop"] = row["woman_25_29_pop"] / 2
-            row["woman_30_34_pop"] = row["woman_30_34_pop"] / 2
-            row["dong_code"] = "11250750"
-            new_list.append(row)
-            row_2 = row.copy()
-            row_2["dong_code"] = "11250770"
-            new_list.append(row_2)
-        elif row["dong_code"] == "11170680":
-            row["man_20_24_pop"] = row["man_20_24_pop"] / 2
-            row["man_25_29_pop"] = row["man_25_29_pop"] / 2
-            row["man_30_34_pop"] = row["man_30_34_pop"] / 2
-            row["woman_20_24_pop"] = row["woman_20_24_pop"] / 2
-            row["woman_25_29_pop"] = row["woman_25_29_pop"] / 2
-            row["woman_30_34_pop"] = row["woman_30_34_pop"] / 2
-            row["dong_code"] = "11170730"
-            new_list.append(row)
-            row_2 = row.copy()
-            row_2["dong_code"] = "11170740"
-            new_list.append(row_2)
-        else:
-            new_list.append(row)
-    df = pd.DataFrame(new_list)
-
-    # 행정동 이름 추가
-    name2code_file_path = os.path.join(utils.check_path("행정동"), "*.json")
-    name2code_file_list = glob.glob(name2code_file_path)
-    name2code_file_path = [f for f in name2code_file_list if "코드" in f][0]
-    name2code = utils.load_data(name2code_file_path)
-
-    code2name = {v: k for k, v in name2code.items()}
-    df["dong_name"] = df["dong_code"].map(code2name)
-    df = df[
-        [
-            "date",
-            "time",
-            "dong_name",
-            "dong_code",
-            "man_20_24_pop",
-            "man_25_29_pop",
-            "man_30_34_pop",
-            "woman_20_24_pop",
-            "woman_25_29_pop",
-            "woman_30_34_pop",
-        ]
-    ]
 
-    data_save_path = data_file_path.replace("raw", "clean")
-    utils.save_data(data_save_path, df, encoding="cp949")
-    LOGGER.info("데이터 처리 완료 - 생활이동 행정동 데이터")
+def update_monthly_sums(engine=None):
+    """저장소의 년월 파티션별로 행정동별 청년 생활인구 부분 합 만들기 (바뀐 달만 다시 계산)
 
+    부분 합마다 원본 파티션의 지문과 행정동 코드 변경 규칙의 해시를 기록해 두고,
+    둘 중 하나라도 바뀐 달만 다시 집계한다. 저장소에서 사라진 달의 부분 합은 삭제한다.
+    (engine: sum_month() 참고)
 
-def sum_living_population_by_dong():
-    """생활인구 데이터를 이용하여, 어느 자치구에 청년이 가장 많이 머무는지 확인하기"""
+    Returns:
+        부분 합이 있는 년월 리스트 (년월 순)
+    """
+    index_path = get_monthly_sum_path("index.json")
+    index = utils.load_data(index_path) if os.path.isfile(index_path) else {}
+    remap_hash = utils_code.get_remap_hash()
+    partitions = utils_store.list_living_population_partitions()
+
+    for ym, fingerprint in partitions.items():
+        entry = {
+            "source": fingerprint,
+            "remap": remap_hash,
+            "format": LP_MONTHLY_SUM_FORMAT,
+        }
+        monthly_path = get_monthly_sum_path(f"{ym}.parquet")
+        if index.get(ym) == entry and os.path.isfile(monthly_path):
+            continue
+        utils.save_data(monthly_path, sum_month(ym, engine=engine))
+        index[ym] = entry
+        LOGGER.info(f"월별 부분 합 갱신 완료 - {ym}")
+
+    for ym in sorted(set(index) - set(partitions)):
+        monthly_path = get_monthly_sum_path(f"{ym}.parquet")
+        if os.path.isfile(monthly_path):
+            os.remove(monthly_path)
+        del index[ym]
+    utils.save_data(index_path, dict(sorted(index.items())))
+    return sorted(index)
+
+
+def load_monthly_sums(year_months, gu=None):
+    """월별 부분 합 불러오기 (year_month column 추가)"""
+    df_list = []
+    for ym in year_months:
+        df = utils.load_data(get_monthly_sum_path(f"{ym}.parquet"))
+        df["year_month"] = ym
+        df_list.append(df)
+    df = pd.concat(df_list, ignore_index=True)
+    if gu is not None:
+        gu = [gu] if isinstance(gu, str) else list(gu)
+        df = df[df["gu"].isin(gu)]
+    return df
+
+
+def get_window_year_months(year_months, n):
+    """가장 최근 년월을 포함한 최근 n개월 중, year_months에 있는 년월 리스트"""
+    latest = datetime.date(int(year_months[-1][:4]), int(year_months[-1][4:]), 1)
+    window = set(utils_manifest.recent_year_months(n, today=latest))
+    return [ym for ym in year_months if ym in window]
+
+
+def get_subset_suffix(gu=None, start=None, end=None):
+    """자치구, 기간을 지정한 분석 결과 파일 이름에 붙일 suffix (지정하지 않으면 "")
+
+    일부만 분석한 결과가 전체 분석 결과(다음 단계의 입력) 파일을 덮어쓰지 않도록 구분한다.
+    예) gu="마포구", start="202301" -> "_마포구_202301-"
+    """
+    parts = []
+    if gu is not None:
+        parts.append("+".join([gu] if isinstance(gu, str) else sorted(gu)))
+    if start is not None or end is not None:
+        parts.append(f"{start or ''}-{end or ''}")
+    return "".join(f"_{part}" for part in parts)
+
+
+@utils.instrument
+def sum_living_population_by_dong(gu=None, start=None, end=None, engine=None):
+    """생활인구 데이터를 이용하여, 어느 자치구에 청년이 가장 많이 머무는지 확인하기
+
+    gu(자치구), start/end(년월, 예: "202301")를 지정하면 해당 자치구, 기간만 분석하고,
+    결과 파일 이름에 get_subset_suffix()를 붙여서 전체 분석 결과와 따로 저장한다.
+    start/end를 지정하지 않으면 행정동별, 자치구별 합(pop_sum)은 가장 최근 달의 합이다.
+    년월별 부분 합을 저장해 두므로, 새로운 달이 추가되면 그 달만 집계한 뒤 합친다.
+    최근 1/3/12개월(LP_ROLLING_WINDOWS) 합은 기간별 합 파일에 따로 저장한다.
+    여러 해의 데이터처럼 한 달 치도 메모리에 올리기 어려우면 engine="arrow"로 집계한다.
+    """
     LOGGER.info("=============================================================")
     LOGGER.info("데이터 분석 시작 - [ 청년들이 많이 머무르는 행정동, 자치구 찾기 ]")
     LOGGER.info("=============================================================")
 
-    file_path = os.path.join(utils.check_path("생활인구"), "*.csv")
-    file_path_list = glob.glob(file_path)
-    file_path = [f for f in file_path_list if "생활인구_데이터" in f and "clean" in f][0]
-    df = utils.load_data(file_path, encoding="cp949")
-
-    # 행정동 데이터 분석
-    dong_df = df.groupby(["dong_name", "dong_code"]).agg(
+    year_months = [
+        ym
+        for ym in update_monthly_sums(engine=engine)
+        if (start is None or ym >= str(start)) and (end is None or ym <= str(end))
+    ]
+    if len(year_months) == 0:
+        raise Exception("분석할 생활인구 데이터 없음")
+    df = load_monthly_sums(year_months, gu=gu)
+    suffix = get_subset_suffix(gu, start, end)
+
+    # 행정동 데이터 분석 (기간을 지정하지 않으면 가장 최근 달만)
+    sum_df = df
+    if start is None and end is None:
+        sum_df = df[df["year_month"] == year_months[-1]]
+    dong_df = sum_df.groupby(["dong_name", "dong_code"]).agg(
         {
             "man_20_24_pop": "sum",
             "man_25_29_pop": "sum",
@@ -212,44 +392,238 @@ def sum_living_population_by_dong():
         ]
     ].sum(axis=1)
     dong_df = dong_df[["dong_name", "dong_code", "pop_sum"]]
-    dong_df_save_path = utils.check_path("생활인구", "생활인구_분석_행정동별_청년_생활인구_합.csv")
+    dong_df_save_path = utils.check_path("생활인구", f"생활인구_분석_행정동별_청년_생활인구_합{suffix}.csv")
     utils.save_data(dong_df_save_path, dong_df, encoding="cp949")
-    LOGGER.info("데이터 분석 완료 - 청년들이 많이 머무르는 행정동 찾기")
+    # 다음 단계에서 dtype(문자열 행정동 코드 등)을 그대로 읽을 수 있도록 parquet으로도 저장
+    utils.save_data(dong_df_save_path.replace(".csv", ".parquet"), dong_df)
+    LOGGER.info(
+        f"데이터 분석 완료 - 청년들이 많이 머무르는 행정동 찾기 " f"({sorted(sum_df['year_month'].unique())})"
+    )
 
     # 자치구 데이터 분석
-    gu2pop = defaultdict(int)
-    for row in dong_df.itertuples():
-        gu = row.dong_name.split()
-        gu = f"{gu[0]} {gu[1]}"
-        gu2pop[gu] += row.pop_sum
-    gu_df = pd.DataFrame(gu2pop.items(), columns=["gu_name", "pop_sum"])
+    gu_name = dong_df["dong_name"].str.split().str[:2].str.join(" ")
+    gu_df = dong_df.groupby(gu_name.rename("gu_name"), sort=False)["pop_sum"].sum()
+    gu_df = gu_df.reset_index()
     gu_df = gu_df.sort_values(by=["pop_sum"], ascending=False)
-    gu_df_save_path = utils.check_path("생활인구", "생활인구_분석_자치구별_청년_생활인구_합.csv")
+    gu_df_save_path = utils.check_path("생활인구", f"생활인구_분석_자치구별_청년_생활인구_합{suffix}.csv")
     utils.save_data(gu_df_save_path, gu_df, encoding="cp949")
+    utils.add_metric("rows_out", len(dong_df) + len(gu_df))
     LOGGER.info("데이터 분석 완료 - 청년들이 많이 머무르는 자치구 찾기")
 
+    # 최근 n개월 합
+    window_df = df.groupby(["dong_name", "dong_code"]).size().reset_index()
+    window_df = window_df[["dong_name", "dong_code"]]
+    for n in LP_ROLLING_WINDOWS:
+        window = df[df["year_month"].isin(get_window_year_months(year_months, n))]
+        window_sum = window.groupby(["dong_name", "dong_code"])[POP_COLUMNS].sum()
+        window_sum = window_sum.sum(axis=1).rename(f"pop_sum_{n}m").reset_index()
+        window_df = window_df.merge(
+            window_sum, on=["dong_name", "dong_code"], how="left"
+        )
+    window_columns = [f"pop_sum_{n}m" for n in LP_ROLLING_WINDOWS]
+    window_df[window_columns] = window_df[window_columns].fillna(0)
+    window_df_save_path = utils.check_path(
+        "생활인구", f"생활인구_분석_행정동별_청년_생활인구_기간별_합{suffix}.csv"
+    )
+    utils.save_data(window_df_save_path, window_df, encoding="cp949")
+
+    gu_name = window_df["dong_name"].str.split().str[:2].str.join(" ")
+    gu_window_df = window_df.groupby(gu_name.rename("gu_name"), sort=False)[
+        window_columns
+    ].sum()
+    gu_window_df = gu_window_df.reset_index()
+    gu_window_df_save_path = utils.check_path(
+        "생활인구", f"생활인구_분석_자치구별_청년_생활인구_기간별_합{suffix}.csv"
+    )
+    utils.save_data(gu_window_df_save_path, gu_window_df, encoding="cp949")
+    LOGGER.info(f"데이터 분석 완료 - 최근 {LP_ROLLING_WINDOWS}개월 합 ({year_months[-1]} 기준)")
+
+
+@utils.instrument
+def build_living_population_cube(gu=None, start=None, end=None, engine=None):
+    """생활인구 집계 큐브 만들기
+
+    (행정동 × 날짜 × 시간대 × 성별 × 연령대) 단위로 청년 생활인구를 합산하고,
+    평일/주말(day_type), 시간대 구간(hour_band), 자치구(gu) 정보를 붙여서 저장한다.
+    자치구 단위로 미리 합산한 큐브도 함께 저장한다.
+    gu, start/end를 지정하면 결과 파일 이름에 get_subset_suffix()를 붙여서 따로 저장한다.
+    engine="arrow"이면 저장소를 달마다 pyarrow로 나누어 읽으며 합산한다. (sum_month() 참고)
+    """
+    LOGGER.info("=============================================================")
+    LOGGER.info("데이터 분석 시작 - [ 생활인구 집계 큐브 ]")
+    LOGGER.info("=============================================================")
+
+    # 행정동 × 날짜 × 시간대 합산 후, 성별 × 연령대를 row로 펼치기
+    # (float32로 합하면 오차가 쌓이므로 float64로 합산 - sum_month()와 같은 값)
+    keys = ["gu", "dong_code", "date", "time"]
+    suffix = get_subset_suffix(gu, start, end)
+    if utils.get_engine(engine) == "arrow":
+        # 날짜가 key이므로 달마다 합산한 결과를 이어 붙이면 전체를 합산한 것과 같다
+        cube_list = []
+        for ym in utils_store.list_living_population_partitions():
+            if (start is not None and ym < str(start)) or (
+                end is not None and ym > str(end)
+            ):
+                continue
+            utils.add_metric("rows_in", utils_store.count_living_population(ym, gu))
+            cube_list.append(
+                utils_store.sum_living_population(ym, keys, POP_COLUMNS, gu=gu)
+            )
+        if len(cube_list) == 0:
+            raise Exception("분석할 생활인구 데이터 없음")
+        cube = pd.concat(cube_list, ignore_index=True)
+    else:
+        df = utils_store.read_living_population(
+            gu=gu, start=start, end=end, columns=keys + POP_COLUMNS
+        )
+        df[POP_COLUMNS] = df[POP_COLUMNS].astype("float64")
+        utils.add_metric("rows_in", len(df))
+        cube = df.groupby(keys, observed=True, sort=False)[POP_COLUMNS].sum()
+        cube = cube.reset_index()
+    cube["time"] = cube["time"].astype("int8")
+    cube = cube.melt(
+        id_vars=keys, value_vars=POP_COLUMNS, var_name="bucket", value_name="pop"
+    )
+    # 성별, 연령대는 column 이름 6개에서만 추출하고, row에는 code로 붙임
+    bucket = pd.Categorical(cube.pop("bucket"), categories=POP_COLUMNS).codes
+    buckets = pd.Series(POP_COLUMNS).str.extract(r"^(man|woman)_(\d+_\d+)_pop$")
+    for name, values in zip(["sex", "age"], buckets.T.to_numpy()):
+        categories, codes = np.unique(values.astype(str), return_inverse=True)
+        cube[name] = pd.Categorical.from_codes(codes[bucket], categories=categories)
+
+    # 평일/주말 (날짜별로 한 번만 계산), 시간대 구간
+    dates = pd.Index(cube["date"].unique())
+    weekday = pd.to_datetime(dates.astype(str), format="%Y%m%d").dayofweek
+    is_weekend = (weekday >= 5)[dates.get_indexer(cube["date"])]
+    cube["day_type"] = pd.Categorical(np.where(is_weekend, "weekend", "weekday"))
+    cube["hour_band"] = pd.Categorical.from_codes(
+        HOUR_BAND_CODES[cube["time"].to_numpy()], categories=list(HOUR_BANDS)
+    )
+    cube["gu"] = cube["gu"].astype("category")
+    cube["dong_code"] = cube["dong_code"].astype("category")
+    cube = cube[CUBE_KEYS["dong"] + ["pop"]]
+
+    dong_cube_save_path = utils.check_path("생활인구", f"생활인구_분석_큐브_행정동{suffix}.parquet")
+    utils.save_data(dong_cube_save_path, cube)
+    LOGGER.info(f"데이터 분석 완료 - 행정동 단위 집계 큐브 ({len(cube):,} rows)")
+
+    gu_cube = cube.groupby(CUBE_KEYS["gu"], observed=True, sort=False)["pop"].sum()
+    gu_cube = gu_cube.reset_index()
+    gu_cube_save_path = utils.check_path("생활인구", f"생활인구_분석_큐브_자치구{suffix}.parquet")
+    utils.save_data(gu_cube_save_path, gu_cube)
+    utils.add_metric("rows_out", len(cube) + len(gu_cube))
+    LOGGER.info(f"데이터 분석 완료 - 자치구 단위 집계 큐브 ({len(gu_cube):,} rows)")
 
-def visualize_living_population_by_dong():
-    """행정동별 생활인구 수 시각화하기"""
+
+@utils_cache.cached(inputs=LP_CUBE_FILES, disk=False)
+def load_living_population_cube(level="gu"):
+    """저장된 생활인구 집계 큐브 불러오기 (level: "dong" 또는 "gu")
+
+    큐브 파일이 바뀌지 않았으면 메모리에 있는 큐브를 재사용한다. (수정하지 말 것)
+    """
+    level_name = {"dong": "행정동", "gu": "자치구"}[level]
+    file_path = utils.check_path("생활인구", f"생활인구_분석_큐브_{level_name}.parquet")
+    if not os.path.isfile(file_path):
+        raise Exception(f'파일 없음: "{file_path}"')
+    return pd.read_parquet(file_path)
+
+
+@utils_cache.cached(inputs=LP_CUBE_FILES)
+def query_living_population_cube(by=None, level=None, **conditions):
+    """집계 큐브에서 조건에 맞는 청년 생활인구 합 구하기
+
+    예) 마포구 평일 밤 25~29세 여성:
+        query_living_population_cube(
+            gu="마포구", day_type="weekday", hour_band="night", sex="woman", age="25_29"
+        )
+
+    Args:
+        by: 결과를 나눌 column 리스트 (없으면 전체 합을 float로 반환)
+        level: 사용할 큐브 ("dong" 또는 "gu", 없으면 조건에 맞춰 자동 선택)
+        conditions: gu, dong_code, date, time, sex, age, day_type, hour_band의 값 또는 리스트
+    """
+    columns = set(conditions) | set(by or [])
+    if level is None:
+        level = "gu" if columns <= set(CUBE_KEYS["gu"]) else "dong"
+    cube = load_living_population_cube(level)
+
+    mask = np.ones(len(cube), dtype=bool)
+    for column, value in conditions.items():
+        values = [value] if isinstance(value, (str, int)) else list(value)
+        mask &= cube[column].isin(values).to_numpy()
+    cube = cube[mask]
+
+    if by is None:
+        return float(cube["pop"].sum())
+    result = cube.groupby(by, observed=True)["pop"].sum()
+    return result.reset_index()
+
+
+@utils.instrument
+@utils_cache.cached(
+    inputs=[LP_DONG_SUM_FILE, "행정동/행정동_경계_v*.json"],
+    outputs=["시각화/행정동별_생활인구_수_합.png"],
+)
+def visualize_living_population_by_dong(backend="browser"):
+    """행정동별 생활인구 수 시각화하기 (backend: "browser" 또는 "static")
+
+    행정동별 합, 행정동 경계 파일이 그대로이고 지도 이미지가 있으면 다시 그리지 않는다.
+    """
     LOGGER.info("=============================================================")
     LOGGER.info("데이터 분석 시작 - [ 행정동별 생활인구 수 시각화 ]")
     LOGGER.info("=============================================================")
 
-    df_file_path = utils.check_path("생활인구", "생활인구_분석_행정동별_청년_생활인구_합.csv")
-    df = utils.load_data(df_file_path, encoding="cp949")
+    df_file_path = utils.check_path("생활인구", "생활인구_분석_행정동별_청년_생활인구_합.parquet")
+    df = utils.load_data(df_file_path)
+    utils.add_metric("rows_in", len(df))
+
+    # 시각화 (GIS, 브라우저 관련 모듈은 이 단계에서만 불러온다)
+    import utils_vis
 
-    # 시각화
-    df["dong_code"] = df["dong_code"].apply(str)
     utils_vis.visualize_by_dong(
         df=df,
         columns=["dong_code", "pop_sum"],
         aliases_columns=["행정동:", "생활인구 합:"],
         legend_name="행정동별_생활인구_수_합",
+        backend=backend,
     )
 
 
+@utils.instrument
+def export_living_population_layers():
+    """보고서 지도용 행정동 경계(TopoJSON)와 행정동별 생활인구 지표(JSON) 저장하기
+
+    경계는 모든 지도가 함께 쓰는 파일 1개로, 지표는 지도마다 {행정동 코드: 값} 파일 1개로 저장하여
+    보고서 페이지(report/map.js)가 브라우저에서 합쳐서 그린다.
+    """
+    LOGGER.info("=============================================================")
+    LOGGER.info("데이터 분석 시작 - [ 보고서 지도 데이터 저장 ]")
+    LOGGER.info("=============================================================")
+
+    df_file_path = utils.check_path("생활인구", "생활인구_분석_행정동별_청년_생활인구_합.parquet")
+    df = utils.load_data(df_file_path)
+    window_df_file_path = utils.check_path("생활인구", "생활인구_분석_행정동별_청년_생활인구_기간별_합.csv")
+    window_df = utils.load_data(window_df_file_path, encoding="cp949")
+    utils.add_metric("rows_in", len(df) + len(window_df))
+
+    # 시각화 (GIS 관련 모듈은 이 단계에서만 불러온다)
+    import utils_vis
+
+    utils_vis.save_report_boundary()
+    utils_vis.save_report_metric(df, "pop_sum", "행정동별_생활인구_수_합", "생활인구 합:")
+    for n in LP_ROLLING_WINDOWS:
+        utils_vis.save_report_metric(
+            window_df,
+            f"pop_sum_{n}m",
+            f"행정동별_최근_{n}개월_생활인구_수_합",
+            f"최근 {n}개월 생활인구 합:",
+        )
+    utils.add_metric("rows_out", len(df) + len(window_df) * len(LP_ROLLING_WINDOWS))
+    LOGGER.info("데이터 분석 완료 - 보고서 지도 데이터 저장")
+
+
 if __name__ == "__main__":
-    # process_living_population_dong_code()
-    # process_living_population_data()
-    # sum_living_population_by_dong()
-    visualize_living_population_by_dong()
+    # 예) python analysis_lp_data.py process_living_population_data --force
+    import pipeline
+
+    pipeline.main(sys.argv[1:] or ["analysis"])
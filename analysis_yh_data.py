@@ -0,0 +1,198 @@
+import os
+import re
+import sys
+
+import numpy as np
+import pandas as pd
+
+import analysis_lp_data
+import utils
+import utils_cache
+import utils_code
+
+LOGGER = utils.set_logger()
+
+# 주소 정규화: 괄호 안 설명, 연속된 공백 제거
+ADDRESS_PAREN_PATTERN = re.compile(r"\([^)]*\)")
+ADDRESS_SPACE_PATTERN = re.compile(r"\s+")
+# 도로명 주소에서 건물 번호까지만 남기기 (예: "서울 마포구 양화로 45 A동" → "서울 마포구 양화로 45")
+ADDRESS_ROAD_PATTERN = re.compile(r"^(서울 \S+구 \S+(?:로|길) \d+(?:-\d+)?)")
+# "총 123호", "총 45실"에서 숫자 추출
+HOUSING_COUNT_PATTERN = r"(\d+)\s*{}$"
+
+
+def normalize_address(address):
+    """주소 column 정규화하기 (서울특별시 → 서울, 괄호 및 중복 공백 제거)"""
+    address = address.fillna("").astype(str)
+    address = address.str.replace("서울특별시", "서울", regex=False)
+    address = address.str.replace(ADDRESS_PAREN_PATTERN, " ", regex=True)
+    address = address.str.replace(ADDRESS_SPACE_PATTERN, " ", regex=True)
+    return address.str.strip()
+
+
+def get_geocode_table_path():
+    """주소 → 좌표 변환표(오프라인) 경로 가져오기
+
+    address, lon, lat(WGS84) column을 가진 CSV 파일
+    (예: 도로명주소 위치정보 DB에서 서울 건물만 골라 경위도로 변환한 파일)
+    """
+    return utils.check_path("청년주택", "청년주택_주소_좌표.csv")
+
+
+def geocode_addresses(address, geocode_df):
+    """주소 column을 변환표로 좌표(lon, lat)로 바꾸기
+
+    정규화한 주소가 그대로 있으면 그 좌표를, 없으면 건물 번호까지의 도로명 주소로 다시 찾는다.
+
+    Returns:
+        address와 같은 index를 가진 DataFrame (lon, lat, 찾지 못한 주소는 NaN)
+    """
+    geocode_df = geocode_df.assign(address=normalize_address(geocode_df["address"]))
+    geocode_df = geocode_df.drop_duplicates("address").set_index("address")
+
+    address = normalize_address(address)
+    coords = geocode_df[["lon", "lat"]].reindex(address.to_numpy())
+    coords.index = address.index
+
+    # 도로명 주소(건물 번호까지)로 다시 찾기
+    missing = coords["lon"].isna().to_numpy()
+    if missing.any():
+        road = geocode_df.index.to_series().str.extract(ADDRESS_ROAD_PATTERN)[0]
+        road_df = geocode_df.assign(road=road.to_numpy()).dropna(subset=["road"])
+        road_df = road_df.drop_duplicates("road").set_index("road")
+        keys = address[missing].str.extract(ADDRESS_ROAD_PATTERN)[0]
+        coords.loc[missing, ["lon", "lat"]] = (
+            road_df[["lon", "lat"]].reindex(keys.to_numpy()).to_numpy()
+        )
+    return coords
+
+
+def join_points_to_dong(lon, lat, geo_df):
+    """좌표가 속한 행정동 코드 찾기 (STRtree 공간 색인으로 point-in-polygon)
+
+    행정동 경계선 위의 좌표도 찾을 수 있도록 intersects로 조회하고,
+    여러 행정동에 걸치면 첫 번째 행정동을 사용한다.
+
+    Returns:
+        좌표 순서대로의 행정동 코드 배열 (어느 행정동에도 속하지 않으면 None)
+    """
+    import shapely
+
+    points = shapely.points(np.asarray(lon, dtype=float), np.asarray(lat, dtype=float))
+    tree = shapely.STRtree(geo_df.geometry.values)
+    point_index, dong_index = tree.query(points, predicate="intersects")
+    point_index, first = np.unique(point_index, return_index=True)
+
+    dong_codes = np.full(len(points), None, dtype=object)
+    dong_codes[point_index] = geo_df["dong_code"].to_numpy()[dong_index[first]]
+    return dong_codes
+
+
+@utils_cache.cached(inputs=["생활인구/생활인구_분석_큐브_행정동.parquet"])
+def get_youth_population_by_dong():
+    """행정동별 평균 청년 생활인구 (시간대 1개당) 구하기 - 생활인구 집계 큐브 이용"""
+    cube = analysis_lp_data.load_living_population_cube("dong")
+    num_slots = len(cube[["date", "time"]].drop_duplicates())
+    youth_df = cube.groupby("dong_code", observed=True)["pop"].sum().reset_index()
+    youth_df["youth_pop"] = youth_df["pop"] / max(num_slots, 1)
+    return youth_df[["dong_code", "youth_pop"]]
+
+
+def summarize_supply_demand(df, keys):
+    """keys 단위로 청년주택 공급(호수, 실수)과 청년 생활인구 비교하기"""
+    df = df.copy()
+    df["ho_per_1000_youth"] = df["ho"] / df["youth_pop"] * 1000
+    df["sil_per_1000_youth"] = df["sil"] / df["youth_pop"] * 1000
+    df = df.replace([np.inf, -np.inf], np.nan)
+    return df.sort_values(by=["ho_per_1000_youth"], ascending=False)[
+        keys
+        + [
+            "num_sites",
+            "ho",
+            "sil",
+            "youth_pop",
+            "ho_per_1000_youth",
+            "sil_per_1000_youth",
+        ]
+    ]
+
+
+@utils.instrument
+def analyze_youth_housing_supply():
+    """역세권 청년주택 공급량과 청년 생활인구(수요)를 행정동, 자치구별로 비교하기
+
+    청년주택 주소를 오프라인 변환표로 좌표로 바꾸고, 행정동 경계와 공간 조인하여
+    행정동별 공급량(호수, 실수)을 구한 뒤, 청년 생활인구 1,000명당 공급량을 계산한다.
+    """
+    LOGGER.info("=============================================================")
+    LOGGER.info("데이터 분석 시작 - [ 역세권 청년주택 공급 vs. 청년 생활인구 ]")
+    LOGGER.info("=============================================================")
+
+    # 주소 → 좌표 변환표는 수집 단계가 없으므로(직접 준비), 없으면 분석하지 않는다
+    geocode_path = get_geocode_table_path()
+    if not os.path.isfile(geocode_path):
+        LOGGER.warning(f'데이터 분석 생략 - 주소 좌표 변환표 없음: "{geocode_path}"')
+        return
+
+    import utils_vis
+
+    housing_path = utils.check_path("청년주택", "역세권_청년주택_raw.csv")
+    housing_df = utils.load_data(housing_path, encoding="cp949")
+    utils.add_metric("rows_in", len(housing_df))
+    for column, unit in (("ho", "호"), ("sil", "실")):
+        count = housing_df[column].astype(str).str.replace(",", "", regex=False)
+        count = count.str.extract(HOUSING_COUNT_PATTERN.format(unit))[0]
+        housing_df[column] = pd.to_numeric(count, errors="coerce").fillna(0)
+
+    # 주소 → 좌표 → 행정동
+    geocode_df = utils.load_data(geocode_path)
+    coords = geocode_addresses(housing_df["address"], geocode_df)
+    housing_df[["lon", "lat"]] = coords.to_numpy()
+    geo_df, _ = utils_vis.process_geo_data(tolerance=0)
+    housing_df["dong_code"] = None
+    located = housing_df["lon"].notna().to_numpy()
+    housing_df.loc[located, "dong_code"] = join_points_to_dong(
+        housing_df.loc[located, "lon"], housing_df.loc[located, "lat"], geo_df
+    )
+    unmatched = housing_df["dong_code"].isna()
+    if unmatched.any():
+        LOGGER.info(
+            f"행정동을 찾지 못한 청년주택 {unmatched.sum()}곳 - "
+            f"{housing_df.loc[unmatched, 'address'].tolist()}"
+        )
+    housing_save_path = utils.check_path("청년주택", "역세권_청년주택_행정동.csv")
+    utils.save_data(housing_save_path, housing_df, encoding="cp949")
+
+    # 행정동별 공급량 + 청년 생활인구
+    supply_df = (
+        housing_df[~unmatched]
+        .groupby("dong_code")
+        .agg(num_sites=("address", "size"), ho=("ho", "sum"), sil=("sil", "sum"))
+        .reset_index()
+    )
+    dong_df = get_youth_population_by_dong().merge(
+        supply_df, on="dong_code", how="left"
+    )
+    dong_df[["num_sites", "ho", "sil"]] = dong_df[["num_sites", "ho", "sil"]].fillna(0)
+    dong_df["dong_name"] = utils_code.lookup(dong_df["dong_code"], "scode2name")
+    dong_df["gu"] = utils_code.lookup(dong_df["dong_code"], "scode2gu")
+
+    dong_result = summarize_supply_demand(dong_df, ["gu", "dong_name", "dong_code"])
+    dong_save_path = utils.check_path("청년주택", "청년주택_분석_행정동별_공급_수요.csv")
+    utils.save_data(dong_save_path, dong_result, encoding="cp949")
+    LOGGER.info("데이터 분석 완료 - 행정동별 청년주택 공급 vs. 청년 생활인구")
+
+    gu_df = dong_df.groupby("gu", observed=True)[
+        ["num_sites", "ho", "sil", "youth_pop"]
+    ].sum()
+    gu_result = summarize_supply_demand(gu_df.reset_index(), ["gu"])
+    gu_save_path = utils.check_path("청년주택", "청년주택_분석_자치구별_공급_수요.csv")
+    utils.save_data(gu_save_path, gu_result, encoding="cp949")
+    utils.add_metric("rows_out", len(dong_result) + len(gu_result))
+    LOGGER.info("데이터 분석 완료 - 자치구별 청년주택 공급 vs. 청년 생활인구")
+
+
+if __name__ == "__main__":
+    import pipeline
+
+    pipeline.main(sys.argv[1:] or ["analyze_youth_housing_supply"])
@@ -0,0 +1,422 @@
+import argparse
+import datetime
+import multiprocessing
+import os
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import utils
+import utils_code
+
+LOGGER = utils.set_logger()
+
+# 가상 데이터 크기: 행정동 수, 하루 시간대 수, 한 달 일 수
+BENCH_NUM_DONGS = 424
+BENCH_NUM_HOURS = 24
+BENCH_NUM_DAYS = 30
+# 가상 데이터의 행정동 코드, 행정동 경계 버전
+BENCH_VERSION = "2023-07-01"
+# 측정할 규모 (1배 = 1개월 분량)
+BENCH_SCALES = (1, 10, 50)
+# 측정할 단계: {이름: "모듈:함수"}
+BENCH_STAGES = {
+    "process_living_population_data": "analysis_lp_data:process_living_population_data",
+    "sum_living_population_by_dong": "analysis_lp_data:sum_living_population_by_dong",
+    "sum_living_population_by_dong_arrow": "analysis_lp_data:sum_living_population_by_dong",
+    "build_living_population_cube": "analysis_lp_data:build_living_population_cube",
+    "build_living_population_cube_arrow": "analysis_lp_data:build_living_population_cube",
+    "visualize_living_population_by_dong": "analysis_lp_data:visualize_living_population_by_dong",
+}
+# 이전 측정값(중앙값)보다 이 비율 이상 느려지거나 메모리를 더 쓰면 성능 저하로 판단
+BENCH_THRESHOLD = 1.25
+
+# import 시간을 측정할 모듈과, 그 모듈을 import할 때 불러오면 안 되는 모듈
+# (GIS, 브라우저 관련 모듈은 해당 단계를 실행할 때만 불러와야 한다)
+GIS_BROWSER_MODULES = [
+    "folium",
+    "geopandas",
+    "shapely",
+    "matplotlib",
+    "selenium",
+    "webdriver_manager",
+    "bs4",
+    "tqdm",
+]
+IMPORT_BUDGETS = {
+    "pipeline": GIS_BROWSER_MODULES + ["pandas", "numpy", "pyarrow", "requests"],
+    "analysis_lp_data": GIS_BROWSER_MODULES + ["requests"],
+    "analysis_lm_data": GIS_BROWSER_MODULES + ["requests"],
+    "analysis_yh_data": GIS_BROWSER_MODULES + ["requests"],
+    "data_collector": GIS_BROWSER_MODULES,
+}
+# import 시간 측정 반복 횟수 (가장 짧은 시간을 사용)
+IMPORT_REPEAT = 3
+
+# 서울시 자치구 (통계청 자치구 코드 순서)
+# fmt: off
+SEOUL_GU_NAMES = [
+    "종로구", "중구", "용산구", "성동구", "광진구", "동대문구", "중랑구", "성북구", "강북구",
+    "도봉구", "노원구", "은평구", "서대문구", "마포구", "양천구", "강서구", "구로구", "금천구",
+    "영등포구", "동작구", "관악구", "서초구", "강남구", "송파구", "강동구",
+]
+# fmt: on
+
+# 생활인구 원본 CSV column (성별 × 연령대)
+LP_AGE_GROUPS = ["0세부터9세", "10세부터14세", "15세부터19세"] + [
+    f"{age}세부터{age + 4}세" for age in range(20, 70, 5)
+]
+LP_RAW_HEADER = ["기준일ID", "시간대구분", "행정동코드", "총생활인구수"] + [
+    f"{sex}{age}생활인구수" for sex in ("남자", "여자") for age in LP_AGE_GROUPS + ["70세이상"]
+]
+
+
+def get_bench_dir(scale):
+    """규모별 가상 데이터 디렉토리 (_dataset 역할) 경로 가져오기"""
+    return utils.check_path("benchmark", f"data_{scale}x", "_dataset")
+
+
+def make_dong_fixture(num_dongs=BENCH_NUM_DONGS):
+    """가상 행정동 목록 만들기
+
+    행정동 코드 변경 규칙(DONG_CODE_REMAP)의 현재 행정동은 반드시 포함하고,
+    나머지는 자치구마다 고르게 나누어 만든다.
+
+    Returns:
+        ({"서울 <자치구> <행정동>": 통계청 행정동 코드}, 과거 행정동 코드 리스트)
+    """
+    gu_codes = {f"{11010 + 10 * i}": gu for i, gu in enumerate(SEOUL_GU_NAMES)}
+    new_codes = sorted(
+        {new for rules in utils_code.DONG_CODE_REMAP.values() for new, _ in rules}
+    )
+
+    name2code = {}
+    for code in new_codes:
+        name2code[f"서울 {gu_codes[code[:5]]} 현재{code[5:]}동"] = code
+    for i in range(num_dongs - len(new_codes)):
+        gu_code = list(gu_codes)[i % len(gu_codes)]
+        code = f"{gu_code}{100 + i // len(gu_codes):03d}"
+        name2code[f"서울 {gu_codes[gu_code]} 가상{code[5:]}동"] = code
+    return name2code, sorted(utils_code.DONG_CODE_REMAP)
+
+
+def make_geo_fixture(name2code, cell_size=0.01):
+    """가상 행정동 경계(GeoJSON) 만들기 (행정동마다 격자 한 칸)"""
+    num_cols = int(np.ceil(np.sqrt(len(name2code))))
+    features = []
+    for i, (name, code) in enumerate(sorted(name2code.items(), key=lambda x: x[1])):
+        row, col = divmod(i, num_cols)
+        x, y = 126.8 + col * cell_size, 37.45 + row * cell_size
+        ring = [
+            [x, y],
+            [x + cell_size, y],
+            [x + cell_size, y + cell_size],
+            [x, y + cell_size],
+            [x, y],
+        ]
+        features.append(
+            {
+                "type": "Feature",
+                "properties": {"sidonm": "서울특별시", "adm_cd8": code, "adm_nm": name},
+                "geometry": {"type": "Polygon", "coordinates": [ring]},
+            }
+        )
+    return {"type": "FeatureCollection", "features": features}
+
+
+def make_living_population_month(year_month, h_codes, seed=0):
+    """가상 생활인구 원본 데이터 1개월 만들기 (행정동 × 시간대 × 일)"""
+    rng = np.random.default_rng(seed)
+    first_day = datetime.date(int(year_month[:4]), int(year_month[4:]), 1)
+    dates = [
+        int((first_day + datetime.timedelta(days=d)).strftime("%Y%m%d"))
+        for d in range(BENCH_NUM_DAYS)
+    ]
+    date, time_, code = np.meshgrid(
+        dates, range(BENCH_NUM_HOURS), h_codes, indexing="ij"
+    )
+    df = pd.DataFrame(
+        {
+            "기준일ID": date.ravel(),
+            "시간대구분": time_.ravel(),
+            "행정동코드": code.ravel(),
+        }
+    )
+    pops = rng.gamma(2.0, 150.0, size=(len(df), len(LP_RAW_HEADER) - 4)).round(4)
+    df["총생활인구수"] = pops.sum(axis=1).round(4)
+    for i, column in enumerate(LP_RAW_HEADER[4:]):
+        df[column] = pops[:, i]
+    return df
+
+
+def write_living_population_raw(file_path, df):
+    """생활인구 원본 CSV 형식(각 줄 끝에 구분자가 하나 더 붙음)으로 저장하기"""
+    with open(file_path, "w", encoding="utf-8") as f:
+        f.write(",".join(LP_RAW_HEADER) + "\n")
+    df = df.assign(_end="")
+    df.to_csv(file_path, mode="a", header=False, index=False)
+
+
+def make_bench_dataset(scale, force=False):
+    """규모에 맞는 가상 데이터 만들기 (이미 있으면 재사용)
+
+    Returns:
+        (가상 데이터 디렉토리 경로, 원본 데이터 row 수)
+    """
+    data_dir = get_bench_dir(scale)
+    done_path = os.path.join(data_dir, "bench_info.json")
+    if not force and os.path.isfile(done_path):
+        return data_dir, utils.load_data(done_path)["rows"]
+
+    LOGGER.info(f"[benchmark] 가상 데이터 만들기 - {scale}배")
+    name2code, retired_codes = make_dong_fixture()
+    s_codes = sorted(name2code.values()) + retired_codes
+    h2s = {str(int(code) * 100): code for code in s_codes}
+
+    def _save(*paths, data):
+        file_path = os.path.join(data_dir, *paths)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        utils.save_data(file_path, data)
+
+    _save("행정동", f"행정동_코드_v{BENCH_VERSION}.json", data=name2code)
+    _save("행정동", f"행정동_경계_v{BENCH_VERSION}.json", data=make_geo_fixture(name2code))
+    _save("생활인구", "생활인구_행정동_코드_h2s.json", data=h2s)
+
+    rows = 0
+    h_codes = np.array([int(h) for h in h2s], dtype=np.int64)
+    for i in range(scale):
+        year, month = divmod(2019 * 12 + i, 12)
+        ym = f"{year}{month + 1:02d}"
+        df = make_living_population_month(ym, h_codes, seed=i)
+        raw_path = os.path.join(data_dir, "생활인구", f"생활인구_데이터_{ym[2:]}_행정동_raw.csv")
+        write_living_population_raw(raw_path, df)
+        rows += len(df)
+
+    _save("bench_info.json", data={"scale": scale, "rows": rows})
+    return data_dir, rows
+
+
+def _run_stage(data_dir, func_path, kwargs):
+    """(별도 프로세스에서) 가상 데이터를 대상으로 단계 하나를 실행하고 측정하기
+
+    Returns:
+        (실행 시간(초), 실행 전 RSS(MB), 최대 RSS(MB))
+    """
+    import importlib
+
+    import utils_cache
+
+    utils.DATA_DIR = data_dir
+    # 보고서(report/), 측정 기록(main_metrics.jsonl), profile/은 작업 디렉토리 기준으로
+    # 저장되므로, 실제 결과를 덮어쓰지 않도록 가상 데이터 디렉토리(data_{n}x)로 이동
+    os.chdir(os.path.dirname(data_dir))
+    # 저장해 둔 결과를 쓰지 않고 매번 실제로 실행하여 측정
+    os.environ[utils_cache.CACHE_DISABLE_ENV] = "1"
+    module_name, func_name = func_path.split(":")
+    func = getattr(importlib.import_module(module_name), func_name)
+
+    rss_before = utils.get_peak_rss_mb()
+    start = time.perf_counter()
+    func(**kwargs)
+    seconds = time.perf_counter() - start
+    rss_peak = utils.get_peak_rss_mb()
+    return seconds, rss_before, rss_peak
+
+
+def measure_stage(name, data_dir):
+    """단계 하나를 새 프로세스에서 실행하여, 다른 단계의 메모리 사용량이 섞이지 않게 측정하기"""
+    kwargs = {}
+    if name == "process_living_population_data":
+        kwargs = {"force": True}
+    elif name == "visualize_living_population_by_dong":
+        kwargs = {"backend": "static"}
+    elif name.endswith("_arrow"):
+        kwargs = {"engine": "arrow"}
+    if name.startswith("sum_living_population_by_dong"):
+        # 월별 부분 합을 지워서, 매번 모든 달을 집계하는 시간을 측정
+        shutil.rmtree(
+            os.path.join(data_dir, "생활인구", "생활인구_분석_월별_합"), ignore_errors=True
+        )
+
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        future = pool.submit(_run_stage, data_dir, BENCH_STAGES[name], kwargs)
+        return future.result()
+
+
+def get_results_path():
+    """측정 결과 파일 경로 가져오기"""
+    return utils.check_path("benchmark", "benchmark_결과.csv")
+
+
+def check_regression(
+    result,
+    history,
+    threshold=BENCH_THRESHOLD,
+    keys=("stage", "scale"),
+    columns=("seconds", "peak_rss_mb"),
+):
+    """이전 측정값(keys가 같은 측정)의 중앙값과 비교하여 성능 저하 항목 찾기"""
+    if history is None:
+        return []
+    mask = np.ones(len(history), dtype=bool)
+    for key in keys:
+        mask &= (history[key] == result[key]).to_numpy()
+    history = history[mask]
+    if len(history) == 0:
+        return []
+    regressions = []
+    for column in columns:
+        baseline = history[column].median()
+        if result[column] > baseline * threshold:
+            regressions.append(f"{column}: {result[column]:.2f} (기준 {baseline:.2f})")
+    return regressions
+
+
+def run_benchmark(
+    scales=BENCH_SCALES, stages=None, threshold=BENCH_THRESHOLD, regenerate=False
+):
+    """가상 데이터로 단계별 실행 시간과 최대 메모리 사용량을 측정하고, 결과를 누적 저장하기
+
+    Returns:
+        (측정 결과 DataFrame, 성능 저하 메시지 리스트)
+    """
+    stages = list(BENCH_STAGES) if stages is None else stages
+    results_path = get_results_path()
+    history = None
+    if os.path.isfile(results_path):
+        history = utils.load_data(results_path)
+
+    run_at = datetime.datetime.now().isoformat(timespec="seconds")
+    results = []
+    regressions = []
+    for scale in scales:
+        data_dir, rows = make_bench_dataset(scale, force=regenerate)
+        for name in stages:
+            seconds, rss_before, rss_peak = measure_stage(name, data_dir)
+            result = {
+                "run_at": run_at,
+                "stage": name,
+                "scale": scale,
+                "rows": rows,
+                "seconds": round(seconds, 3),
+                "start_rss_mb": round(rss_before, 1),
+                "peak_rss_mb": round(rss_peak, 1),
+            }
+            results.append(result)
+            LOGGER.info(
+                f"[benchmark] {name} ({scale}배, {rows:,} rows) - "
+                f"{seconds:.2f}초, 최대 메모리 {rss_peak:.1f}MB"
+            )
+            for message in check_regression(result, history, threshold):
+                regressions.append(f"{name} ({scale}배) {message}")
+                LOGGER.warning(f"[benchmark] 성능 저하 - {name} ({scale}배) {message}")
+
+    results = pd.DataFrame(results)
+    utils.save_data(results_path, results, append=history is not None)
+    return results, regressions
+
+
+def measure_import(module_name):
+    """새 Python 프로세스에서 모듈을 import하는 데 걸리는 시간과, 함께 불러온 모듈 확인하기
+
+    Returns:
+        (import 시간(초), 불러온 모듈 이름 집합)
+    """
+    code = f"import sys; import {module_name}; print(' '.join(sys.modules))"
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # -X importtime 출력: "import time: self [us] | cumulative | imported package"
+    seconds = None
+    for line in process.stderr.splitlines():
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip() == module_name:
+            seconds = int(fields[1]) / 1_000_000
+    modules = set(process.stdout.split())
+    return seconds, modules
+
+
+def run_import_benchmark(modules=None, threshold=BENCH_THRESHOLD):
+    """모듈별 import 시간을 측정하고, 불러오면 안 되는 모듈을 불러오는지 확인하기
+
+    Returns:
+        (측정 결과 DataFrame, 문제 메시지 리스트)
+    """
+    modules = list(IMPORT_BUDGETS) if modules is None else modules
+    results_path = utils.check_path("benchmark", "benchmark_import_결과.csv")
+    history = None
+    if os.path.isfile(results_path):
+        history = utils.load_data(results_path)
+
+    run_at = datetime.datetime.now().isoformat(timespec="seconds")
+    results = []
+    regressions = []
+    for module_name in modules:
+        timings = []
+        for _ in range(IMPORT_REPEAT):
+            seconds, loaded = measure_import(module_name)
+            timings.append(seconds)
+        forbidden = sorted(set(IMPORT_BUDGETS.get(module_name, [])) & loaded)
+        result = {
+            "run_at": run_at,
+            "module": module_name,
+            "seconds": round(min(timings), 4),
+            "forbidden_modules": " ".join(forbidden),
+        }
+        results.append(result)
+        LOGGER.info(f"[benchmark] import {module_name} - {result['seconds']:.3f}초")
+
+        messages = check_regression(
+            result, history, threshold, keys=("module",), columns=("seconds",)
+        )
+        if len(forbidden) > 0:
+            messages.append(f"불러오면 안 되는 모듈: {forbidden}")
+        for message in messages:
+            regressions.append(f"import {module_name} {message}")
+            LOGGER.warning(f"[benchmark] 성능 저하 - import {module_name} {message}")
+
+    results = pd.DataFrame(results)
+    utils.save_data(results_path, results, append=history is not None)
+    return results, regressions
+
+
+def main(argv=None):
+    """벤치마크 실행 CLI"""
+    parser = argparse.ArgumentParser(description="가상 데이터를 이용한 분석 단계 벤치마크")
+    parser.add_argument("--scales", type=int, nargs="+", default=list(BENCH_SCALES))
+    parser.add_argument(
+        "--stages", nargs="+", choices=list(BENCH_STAGES), default=list(BENCH_STAGES)
+    )
+    parser.add_argument("--threshold", type=float, default=BENCH_THRESHOLD)
+    parser.add_argument("--regenerate", action="store_true", help="가상 데이터 다시 만들기")
+    parser.add_argument("--check", action="store_true", help="성능 저하가 있으면 오류로 종료하기")
+    parser.add_argument(
+        "--imports", action="store_true", help="단계 대신 모듈 import 시간 측정하기"
+    )
+    args = parser.parse_args(argv)
+
+    if args.imports:
+        _, regressions = run_import_benchmark(threshold=args.threshold)
+    else:
+        _, regressions = run_benchmark(
+            scales=args.scales,
+            stages=args.stages,
+            threshold=args.threshold,
+            regenerate=args.regenerate,
+        )
+    if args.check and len(regressions) > 0:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,185 +1,344 @@
-import datetime
-import glob
 import json
 import os
 import re
-import time
+import sys
 import zipfile
-from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
 
 import pandas as pd
 import requests as rq
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import Select
-from tqdm import tqdm
-from webdriver_manager.chrome import ChromeDriverManager
 
 import utils
+import utils_download
+import utils_manifest
 
 LOGGER = utils.set_logger()
 
-
-def collect_living_population_dong():
-    """서울 생활인구 행정동 데이터 수집하기"""
+# 서울 열린데이터 광장 파일 다운로드 주소
+DATAFILE_URL = (
+    "https://datafile.seoul.go.kr/bigfile/iot/inf/nio_download.do?&useCache=false"
+)
+DATAFILE_HEADERS = {
+    "Host": "datafile.seoul.go.kr",
+    "Origin": "https://data.seoul.go.kr",
+    "Referer": "https://data.seoul.go.kr/",
+}
+
+# 역세권 청년주택 상세 페이지 주소, 상세 페이지에서 정보를 추출하는 정규식
+YOUTH_HOUSING_VIEW_URL = "https://soco.seoul.go.kr/youth/pgm/home/yohome/view.do"
+YOUTH_HOUSING_HOME_CODE_PATTERN = re.compile(r"homeView\(([\d]+)\)")
+YOUTH_HOUSING_TAG_PATTERN = re.compile(r"(<.*?>|\s{2,})")
+YOUTH_HOUSING_ADDRESS_PATTERN = re.compile(r"주소 : ([가-힣\s\d]+)")
+YOUTH_HOUSING_HO_PATTERN = re.compile(r"총 ([가-힣\s\d]+호)")
+YOUTH_HOUSING_SIL_PATTERN = re.compile(r"총 ([가-힣\s\d]+실)")
+
+# 통계분류포털 행정구역분류 코드 검색 주소
+KSSC_URL = (
+    "http://kssc.kostat.go.kr/ksscNew_web/kssc/common/AdCodeConnectionSearchList.do"
+)
+
+
+def is_valid_download(file_path):
+    """다운로드 받은 파일이 정상인지 확인하기 (없는 날짜를 요청하면 zip이 아닌 파일을 받음)"""
+    return not file_path.endswith(".zip") or zipfile.is_zipfile(file_path)
+
+
+@utils.instrument
+def collect_living_population_dong(
+    max_workers=utils_download.DEFAULT_MAX_WORKERS, extract=True
+):
+    """서울 생활인구 행정동 데이터 수집하기 (이전에 받은 파일은 다시 받지 않음)
+
+    extract=False이면 zip 파일을 풀지 않고 '_dataset/생활인구/zip'에 그대로 둔다.
+    (처리 단계에서 source="zip"으로 zip 파일을 바로 읽을 수 있음)
+    """
     LOGGER.info("=============================================================")
     LOGGER.info("데이터 수집 시작 - [ 생활인구 행정동 데이터 ]")
     LOGGER.info("=============================================================")
 
-    url = "https://datafile.seoul.go.kr/bigfile/iot/inf/nio_download.do?&useCache=false"
-    headers = {
-        "Host": "datafile.seoul.go.kr",
-        "Origin": "https://data.seoul.go.kr",
-        "Referer": "https://data.seoul.go.kr/",
+    # 다운로드 대상: 행정동 코드 정보, 최근 5달의 생활인구 데이터
+    jobs = {
+        "dongcode": {
+            "url": DATAFILE_URL,
+            "save_path": utils.check_path("생활인구", "zip", "생활인구_행정동_코드_raw.xlsx"),
+            "data": {"infId": "DOWNLOAD", "infSeq": "4", "seq": "7"},
+            "headers": DATAFILE_HEADERS,
+        }
     }
+    year_month = utils_manifest.recent_year_months(5)
+    for ym in year_month:
+        jobs[ym] = {
+            "url": DATAFILE_URL,
+            "save_path": utils.check_path("생활인구", "zip", f"생활인구_데이터_{ym[2:]}.zip"),
+            "data": {"infId": "OA-14991", "seq": ym[2:], "infSeq": "3"},
+            "headers": DATAFILE_HEADERS,
+        }
+    outputs = utils_manifest.fetch_with_manifest(
+        "생활인구",
+        jobs,
+        revalidate=("dongcode",),
+        validate=is_valid_download,
+        max_workers=max_workers,
+    )
 
-    # 행정동 코드 정보 다운로드
-    dongcode_data = {"infId": "DOWNLOAD", "infSeq": "4", "seq": "7"}
-    dongcode_file = rq.post(url, dongcode_data, headers=headers)
-    dongcode_file = pd.read_excel(BytesIO(dongcode_file.content))
+    # 행정동 코드 정보 저장
+    if "dongcode" not in outputs:
+        raise Exception("데이터 다운로드 실패 - 생활인구 행정동 코드 정보")
     dongcode_save_path = utils.check_path("생활인구", "생활인구_행정동_코드_raw.csv")
-    utils.save_data(dongcode_save_path, dongcode_file, encoding="cp949")
+    if outputs["dongcode"]["changed"] or not os.path.isfile(dongcode_save_path):
+        dongcode_file = pd.read_excel(outputs["dongcode"]["path"])
+        utils.save_data(dongcode_save_path, dongcode_file, encoding="cp949")
     LOGGER.info("데이터 수집 완료 - 생활인구 행정동 코드 정보")
 
-    # 생활인구 데이터 다운로드
+    # 생활인구 데이터 저장 (새로 받았거나 바뀐 달만 압축 해제)
     lp_save_path = utils.check_path("생활인구")
-    lp_data = {"infId": "OA-14991", "seq": "2301", "infSeq": "3"}
-    today = datetime.datetime.today()
-    for x in range(5):
-        new = today - datetime.timedelta(days=30 * x)
-        new_year = str(new.year)[2:]
-        new_month = str(new.month).zfill(2)
-        new = f"{new_year}{new_month}"
-        lp_data["seq"] = new
-
-        try:
-            lp_file = rq.post(url, lp_data, headers=headers)
-            lp_file = zipfile.ZipFile(BytesIO(lp_file.content))
-        except Exception:
-            LOGGER.info(f"데이터 다운로드 실패 - 날짜: {new}")
+    for ym in year_month:
+        if ym not in outputs or not extract:
             continue
-        else:
-            LOGGER.info(f"데이터 다운로드 성공 - 날짜: {new}")
+        extract_path = os.path.join(lp_save_path, f"생활인구_데이터_{ym[2:]}_행정동_raw.csv")
+        if not outputs[ym]["changed"] and os.path.isfile(extract_path):
+            continue
+        with zipfile.ZipFile(outputs[ym]["path"]) as lp_file:
             info = lp_file.infolist()[0]
-            info.filename = f"생활인구_데이터_{new}_행정동_raw.csv"
+            info.filename = os.path.basename(extract_path)
             lp_file.extract(info, lp_save_path)
+        utils_manifest.update_entry("생활인구", ym, extract_path=extract_path)
+        LOGGER.info(f"데이터 수집 완료 - 생활인구 행정동 데이터 ({ym})")
 
-        if len(glob.glob(os.path.join(lp_save_path, "*.csv"))) == 2:
-            # 최근 1달 데이터만 다운로드 (행정동_코드.csv, lp_data.csv)
-            break
-    LOGGER.info(f"데이터 수집 완료 - 생활인구 행정동 데이터 ({new})")
 
+@utils.instrument
+def collect_living_migration_dong(
+    max_workers=utils_download.DEFAULT_MAX_WORKERS, extract=True
+):
+    """서울 생활이동 행정동 데이터 수집하기 (이전에 받은 파일은 다시 받지 않음)
 
-def collect_living_migration_dong():
-    """서울 생활이동 행정동 데이터 수집하기"""
+    extract=False이면 zip 파일을 풀지 않고 '_dataset/생활이동/zip'에 그대로 둔다.
+    (처리 단계에서 source="zip"으로 zip 파일을 바로 읽을 수 있음)
+    """
     LOGGER.info("=============================================================")
     LOGGER.info("데이터 수집 시작 - [ 생활이동 행정동 데이터 ]")
     LOGGER.info("=============================================================")
 
-    url = "https://datafile.seoul.go.kr/bigfile/iot/inf/nio_download.do?&useCache=false"
-    headers = {
-        "Host": "datafile.seoul.go.kr",
-        "Origin": "https://data.seoul.go.kr",
-        "Referer": "https://data.seoul.go.kr/",
+    # 다운로드 대상: 행정동 코드 정보, 최근 5달의 생활이동 데이터
+    jobs = {
+        "dongcode": {
+            "url": DATAFILE_URL,
+            "save_path": utils.check_path("생활이동", "zip", "생활이동_행정동_코드_raw.xlsx"),
+            "data": {"infId": "DOWNLOAD", "infSeq": "4", "seq": "2"},
+            "headers": DATAFILE_HEADERS,
+        }
     }
+    year_month = utils_manifest.recent_year_months(5)
+    for ym in year_month:
+        jobs[ym] = {
+            "url": DATAFILE_URL,
+            "save_path": utils.check_path("생활이동", "zip", f"생활이동_데이터_{ym}.zip"),
+            "data": {"infId": "DOWNLOAD", "infSeq": "2", "seq": ym},
+            "headers": DATAFILE_HEADERS,
+        }
+    outputs = utils_manifest.fetch_with_manifest(
+        "생활이동",
+        jobs,
+        revalidate=("dongcode",),
+        validate=is_valid_download,
+        max_workers=max_workers,
+    )
 
-    # 행정동코드 정보 다운로드
-    dongcode_data = {"infId": "DOWNLOAD", "infSeq": "4", "seq": "2"}
-    dongcode_file = rq.post(url, dongcode_data, headers=headers)
-    dongcode_file = pd.read_excel(BytesIO(dongcode_file.content))
+    # 행정동코드 정보 저장
+    if "dongcode" not in outputs:
+        raise Exception("데이터 다운로드 실패 - 생활이동 행정동 코드 정보")
     dongcode_save_path = utils.check_path("생활이동", "생활이동_행정동_코드_raw.csv")
-    utils.save_data(dongcode_save_path, dongcode_file, encoding="cp949")
+    if outputs["dongcode"]["changed"] or not os.path.isfile(dongcode_save_path):
+        dongcode_file = pd.read_excel(outputs["dongcode"]["path"])
+        utils.save_data(dongcode_save_path, dongcode_file, encoding="cp949")
     LOGGER.info("데이터 수집 완료 - 생활이동 행정동 코드 정보")
 
-    # 생활이동 데이터 다운로드
-    now = time.localtime()
-    year_month = []
-    for x in range(5):
-        new = time.localtime(
-            time.mktime((now.tm_year, now.tm_mon - x, 1, 0, 0, 0, 0, 0, 0))
-        )
-        new = new[:2]
-        new = f"{new[0]}{str(new[1]).zfill(2)}"
-        year_month.append(new)
-
+    # 생활이동 데이터 저장 (새로 받았거나 바뀐 달만 압축 해제)
     for ym in year_month:
-        lm_data = {"infId": "DOWNLOAD", "infSeq": "2", "seq": ym}
-        try:
-            lm_file = rq.post(url, lm_data, headers=headers)
-            lm_file = zipfile.ZipFile(BytesIO(lm_file.content))
-        except Exception:
-            LOGGER.info(f"데이터 다운로드 실패 - 날짜: {ym}")
-        else:
+        if ym not in outputs or not extract:
+            continue
+        lm_save_path = utils.check_path("생활이동", f"생활이동_데이터_{ym}_행정동_raw")
+        if not outputs[ym]["changed"] and len(os.listdir(lm_save_path)) > 0:
+            continue
+        with zipfile.ZipFile(outputs[ym]["path"]) as lm_file:
             zipinfo = lm_file.infolist()
             for info in zipinfo:
-                info.filename = info.filename.encode("cp437").decode("euc-kr")
-                lm_save_path = utils.check_path("생활이동", f"생활이동_데이터_{ym}_행정동_raw")
+                info.filename = utils.get_zip_member_name(info)
                 lm_file.extract(info, lm_save_path)
-            break
-    LOGGER.info(f"데이터 수집 완료 - 생활이동 행정동 데이터 ({ym})")
+        utils_manifest.update_entry("생활이동", ym, extract_path=lm_save_path)
+        LOGGER.info(f"데이터 수집 완료 - 생활이동 행정동 데이터 ({ym})")
 
 
-def collect_latest_dong_code():
-    """최신 행정동 코드 데이터 수집하기"""
-    LOGGER.info("=============================================================")
-    LOGGER.info("데이터 수집 시작 - [ 최신 행정동 코드 데이터 ]")
-    LOGGER.info("=============================================================")
+def open_headless_browser():
+    """headless Chrome 실행하기
 
-    url = (
-        "http://kssc.kostat.go.kr/ksscNew_web/kssc/common/AdCodeConnectionSearchList.do"
-    )
-    browser = webdriver.Chrome(
+    브라우저 관련 모듈(selenium, webdriver_manager)은 import가 느리므로,
+    브라우저가 필요한 수집 함수에서만 불러온다.
+    """
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
+    return webdriver.Chrome(
         service=Service(ChromeDriverManager().install()),
-        options=webdriver.ChromeOptions(),
+        options=options,
     )
-    browser.get(url)
+
+
+def parse_dong_code_table(soup):
+    """행정동 코드 검색 결과 테이블(tbl_type3)에서 데이터 버전과 행정동 코드 추출하기
+
+    Returns:
+        (version, {"서울 <자치구> <행정동>": 행정동 코드})
+    """
+    table = soup.find(class_="tbl_type3")
+    tr = table.find("thead").find_all("tr")[-1]
+    version = tr.find_all("th")[0].get_text(strip=True).replace(".", "-")
+
+    name2code = {}
+    rows = table.find("tbody").find_all("tr")
+    if len(rows) < 2:
+        return version, name2code
+    gu = rows[0].find_all("td")[2].get_text(strip=True)
+    for row in rows[1:]:
+        tds = row.find_all("td")
+        code = tds[1].get_text(strip=True)
+        dong = tds[2].get_text(strip=True)
+        name2code[f"서울 {gu} {dong}"] = code
+    return version, name2code
+
+
+def get_select_options(soup, select_id):
+    """검색 화면의 select 박스에서 {보이는 글자: 값} 가져오기"""
+    select = soup.find("select", id=select_id)
+    return {
+        option.get_text(strip=True): option.get("value", "")
+        for option in select.find_all("option")
+    }
+
+
+def collect_dong_code_by_http(max_workers=8):
+    """브라우저 없이 검색 요청을 직접 보내서, 서울시 자치구별 행정동 코드를 동시에 조회하기"""
+    from bs4 import BeautifulSoup
+    from tqdm import tqdm
+
+    session = utils_download.get_session(pool_size=max_workers)
+    timeout = utils_download.DEFAULT_TIMEOUT
+
+    response = session.get(KSSC_URL, timeout=timeout)
+    response.raise_for_status()
+    soup = BeautifulSoup(response.text, "html.parser")
+    version, _ = parse_dong_code_table(soup)
+    sido_code = get_select_options(soup, "strHighCategoryCode")["서울특별시"]
+    gugun_code = get_select_options(soup, "strSearchGugun")["행정동"]
+
+    # 서울특별시를 선택한 검색 화면에서 자치구 목록 가져오기
+    response = session.post(
+        KSSC_URL, data={"strHighCategoryCode": sido_code}, timeout=timeout
+    )
+    response.raise_for_status()
+    soup = BeautifulSoup(response.text, "html.parser")
+    gu_codes = get_select_options(soup, "strCategoryCode").values()
+    gu_codes = [code for code in gu_codes if code]
+
+    def _search(gu_code):
+        data = {
+            "strHighCategoryCode": sido_code,
+            "strCategoryCode": gu_code,
+            "strSearchGugun": gugun_code,
+        }
+        response = session.post(KSSC_URL, data=data, timeout=timeout)
+        response.raise_for_status()
+        utils.add_metric("bytes_downloaded", len(response.content))
+        _, name2code = parse_dong_code_table(
+            BeautifulSoup(response.text, "html.parser")
+        )
+        return name2code
+
+    name2code = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for gu_name2code in tqdm(executor.map(_search, gu_codes), total=len(gu_codes)):
+            name2code.update(gu_name2code)
+    return version, name2code
+
+
+def collect_dong_code_by_browser():
+    """Chrome으로 검색 화면을 조작하여, 서울시 자치구별 행정동 코드 조회하기"""
+    from bs4 import BeautifulSoup
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import Select, WebDriverWait
+    from tqdm import tqdm
+
+    browser = open_headless_browser()
+    wait = WebDriverWait(browser, 60)
+    browser.get(KSSC_URL)
+    wait.until(EC.presence_of_element_located((By.CLASS_NAME, "tbl_type3")))
 
     # 데이터 버전 (업데이트 날짜) 확인
-    table = browser.find_element(By.CLASS_NAME, "tbl_type3")
-    thead = table.find_element(By.TAG_NAME, "thead")
-    tr = thead.find_elements(By.TAG_NAME, "tr")[-1]
-    version = tr.find_elements(By.TAG_NAME, "th")[0].get_attribute("innerText")
-    version = version.replace(".", "-")
+    version, _ = parse_dong_code_table(
+        BeautifulSoup(browser.page_source, "html.parser")
+    )
 
     name2code = {}
     for i in tqdm(range(25)):  # 서울시 자치구 개수 = 25
         Select(
             browser.find_element(By.ID, "strHighCategoryCode")
         ).select_by_visible_text("서울특별시")
-        time.sleep(1)
+        # 자치구 목록이 채워질 때까지 대기
+        wait.until(
+            lambda b: len(Select(b.find_element(By.ID, "strCategoryCode")).options)
+            > i + 1
+        )
         Select(browser.find_element(By.ID, "strCategoryCode")).select_by_index(i + 1)
-        time.sleep(1)
         Select(browser.find_element(By.ID, "strSearchGugun")).select_by_visible_text(
             "행정동"
         )
+
+        # 이전 검색 결과가 새 결과로 바뀔 때까지 대기
+        old_rows = browser.find_elements(By.CSS_SELECTOR, ".tbl_type3 tbody tr")
         browser.find_element(By.XPATH, '//button[text()="검색"]').click()
-        time.sleep(10)
-
-        table = browser.find_element(By.CLASS_NAME, "tbl_type3")
-        tbody = table.find_element(By.TAG_NAME, "tbody")
-        rows = tbody.find_elements(By.TAG_NAME, "tr")
-        gu = (
-            rows[0]
-            .find_elements(By.TAG_NAME, "td")[2]
-            .get_attribute("innerText")
-            .strip()
+        if len(old_rows) > 0:
+            wait.until(EC.staleness_of(old_rows[0]))
+        wait.until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, ".tbl_type3 tbody tr"))
         )
-        for row in rows[1:]:
-            tds = row.find_elements(By.TAG_NAME, "td")
-            code = tds[1].get_attribute("innerText").strip()
-            dong = tds[2].get_attribute("innerText").strip()
-            name2code[f"서울 {gu} {dong}"] = code
+
+        soup = BeautifulSoup(browser.page_source, "html.parser")
+        name2code.update(parse_dong_code_table(soup)[1])
     browser.close()
+    return version, name2code
+
+
+@utils.instrument
+def collect_latest_dong_code(mode="http", max_workers=8):
+    """최신 행정동 코드 데이터 수집하기
+
+    mode="http"이면 브라우저 없이 25개 자치구를 동시에 조회하고,
+    mode="browser"이면 Chrome(headless)으로 검색 화면을 조작한다.
+    """
+    LOGGER.info("=============================================================")
+    LOGGER.info("데이터 수집 시작 - [ 최신 행정동 코드 데이터 ]")
+    LOGGER.info("=============================================================")
+
+    if mode == "http":
+        version, name2code = collect_dong_code_by_http(max_workers=max_workers)
+    elif mode == "browser":
+        version, name2code = collect_dong_code_by_browser()
+    else:
+        raise Exception(f"지원하지 않는 수집 방식: {mode}")
     name2code = dict(sorted(name2code.items(), key=lambda x: x[0]))
 
     # 데이터 저장
     save_path = utils.check_path("행정동", f"행정동_코드_v{version}.json")
     utils.save_data(save_path, name2code)
+    utils.add_metric("rows_out", len(name2code))
     LOGGER.info(f"데이터 수집 완료 - 최신 행정동 코드 데이터 (ver. {version})")
 
 
+@utils.instrument
 def collect_dong_boundary():
     """행정동 경계 데이터 수집하기"""
     LOGGER.info("=============================================================")
@@ -188,6 +347,7 @@ def collect_dong_boundary():
 
     url = "https://raw.githubusercontent.com/vuski/admdongkor/master/ver20230101/HangJeongDong_ver20230101.geojson"
     response = rq.get(url)
+    utils.add_metric("bytes_downloaded", len(response.content))
     response = response.text
     data = json.loads(response)
 
@@ -199,80 +359,109 @@ def collect_dong_boundary():
     LOGGER.info(f"데이터 수집 완료 - 행정동 경계 데이터 (ver. {version})")
 
 
-def collect_youth_housing_in_station_area():
-    """역세권 청년주택 데이터 수집하기"""
+def parse_youth_housing_page(html):
+    """역세권 청년주택 상세 페이지에서 주소, 호수, 실수 추출하기"""
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    soup = BeautifulSoup(html, "lxml", parse_only=SoupStrainer(class_="dashline"))
+
+    house_info = []
+    for dashline in soup.find_all(class_="dashline"):
+        house_info.extend(dashline.find_all("p"))
+    house_info = [YOUTH_HOUSING_TAG_PATTERN.sub("", str(info)) for info in house_info]
+    house_info = " /// ".join(house_info)
+
+    address = YOUTH_HOUSING_ADDRESS_PATTERN.search(house_info)
+    address = address.group(1).strip()
+    address = address.replace("서울특별시", "서울")
+    ho = YOUTH_HOUSING_HO_PATTERN.search(house_info)
+    ho = ho.group(1).strip()
+    sil = YOUTH_HOUSING_SIL_PATTERN.search(house_info)
+    sil = sil.group(1).strip()
+    return address, ho, sil
+
+
+def fetch_youth_housing_page(session, house_id):
+    """역세권 청년주택 상세 페이지 가져오기"""
+    data = {"menuNo": "400002", "homeCode": house_id}
+    headers = {"User-Agent": "Mozilla/5.0"}
+    response = session.post(
+        YOUTH_HOUSING_VIEW_URL,
+        data=data,
+        headers=headers,
+        timeout=utils_download.DEFAULT_TIMEOUT,
+    )
+    response.raise_for_status()
+    utils.add_metric("bytes_downloaded", len(response.content))
+    return response.text
+
+
+def get_youth_housing_info(session, house_id, refresh=False):
+    """역세권 청년주택 상세 페이지의 주소, 호수, 실수 가져오기
+
+    homeCode별로 저장해 둔 페이지가 있으면 재사용하고, 새로 가져온 페이지는 정보를 추출할 수
+    있을 때만 저장한다. (점검 안내 페이지 등이 저장되어 계속 실패하는 일이 없도록)
+    """
+    cache_path = utils.check_path("청년주택", "html", f"{house_id}.html")
+    if not refresh and os.path.isfile(cache_path):
+        with open(cache_path, "r", encoding="utf-8") as f:
+            html = f.read()
+        try:
+            return parse_youth_housing_page(html)
+        except Exception:
+            LOGGER.info(f"저장된 청년주택 페이지를 읽을 수 없어 다시 가져옴 - {house_id}")
+
+    html = fetch_youth_housing_page(session, house_id)
+    house_info = parse_youth_housing_page(html)
+    with open(cache_path, "w", encoding="utf-8") as f:
+        f.write(html)
+    return house_info
+
+
+@utils.instrument
+def collect_youth_housing_in_station_area(max_workers=8, refresh=False):
+    """역세권 청년주택 데이터 수집하기
+
+    상세 페이지는 max_workers개씩 동시에 가져오고, 이전에 가져온 페이지는
+    '_dataset/청년주택/html/<homeCode>.html'에서 읽는다. (refresh=True이면 모두 다시 가져옴)
+    """
+    from selenium.webdriver.common.by import By
+
     base_url = "https://soco.seoul.go.kr/youth/main/main.do"
 
-    browser = webdriver.Chrome(
-        service=Service(ChromeDriverManager().install()),
-        options=webdriver.ChromeOptions(),
-    )
+    browser = open_headless_browser()
     browser.get(base_url)
     raw_html_list = browser.find_elements(By.CLASS_NAME, "slick-slide")
 
     house_id_list = []
-    ptr = re.compile(r"homeView\(([\d]+)\)")
     for raw_html in raw_html_list:
         try:
             html_str = raw_html.get_attribute("innerHTML")
-            house_id = ptr.search(html_str)
+            house_id = YOUTH_HOUSING_HOME_CODE_PATTERN.search(html_str)
             house_id = house_id.group(1)
             house_id_list.append(house_id)
         except Exception:
             continue
     browser.close()
+    house_id_list = list(dict.fromkeys(house_id_list))  # slick이 복제한 slide 제거
+
+    session = utils_download.get_session(pool_size=max_workers)
 
-    house_list = []
-    for house_id in house_id_list:
-        url = "https://soco.seoul.go.kr/youth/pgm/home/yohome/view.do"
-        data = {"menuNo": "400002", "homeCode": house_id}
-        headers = {"User-Agent": "Mozilla/5.0"}
-        response = rq.post(url, data=data, headers=headers)
-        html = response.text
-        soup = BeautifulSoup(html, "html.parser")
-        dashline_list = soup.find_all(class_="dashline")
-
-        house_info = []
-        for dashline in dashline_list:
-            house_info.extend(dashline.find_all("p"))
-
-        ptr = re.compile(r"(<.*?>|\s{2,})")
-        for index, info in enumerate(house_info):
-            info = re.sub(ptr, "", str(info))
-            house_info[index] = info
-
-        house_info = " /// ".join(house_info)
-        ptr_address = re.compile(r"주소 : ([가-힣\s\d]+)")
-        ptr_ho = re.compile(r"총 ([가-힣\s\d]+호)")
-        ptr_sil = re.compile(r"총 ([가-힣\s\d]+실)")
-
-        address = ptr_address.search(house_info)
-        address = address.group(1).strip()
-        address = address.replace("서울특별시", "서울")
-        ho = ptr_ho.search(house_info)
-        ho = ho.group(1).strip()
-        sil = ptr_sil.search(house_info)
-        sil = sil.group(1).strip()
-        house_list.append((address, ho, sil))
+    def _collect(house_id):
+        return get_youth_housing_info(session, house_id, refresh=refresh)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        house_list = list(executor.map(_collect, house_id_list))
     df = pd.DataFrame(house_list, columns=["address", "ho", "sil"])
 
     save_path = utils.check_path("청년주택", "역세권_청년주택_raw.csv")
     utils.save_data(save_path, df, encoding="cp949")
+    utils.add_metric("rows_out", len(df))
     LOGGER.info("데이터 수집 완료 - 역세권 청년주택 데이터")
 
 
 if __name__ == "__main__":
-    # # 생활인구 데이터
-    # collect_living_population_dong()
-
-    # # 생활이동 데이터
-    # collect_living_migration_dong()
-
-    # # 최신 행정동 코드 데이터
-    # collect_latest_dong_code()
-
-    # # 행정동 경계 데이터
-    # collect_dong_boundary()
+    # 예) python data_collector.py collect_latest_dong_code --force
+    import pipeline
 
-    # 역세권 청년 주택 데이터
-    collect_youth_housing_in_station_area()
+    pipeline.main(sys.argv[1:] or ["collect"])
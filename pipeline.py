@@ -0,0 +1,376 @@
+import argparse
+import glob
+import importlib
+import inspect
+import os
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+
+import utils
+
+LOGGER = utils.set_logger()
+
+# 파이프라인 단계: {이름: {"func": "모듈:함수", "deps": 선행 단계, "inputs"/"outputs": 파일 패턴}}
+# (inputs, outputs는 _dataset 기준 상대 경로이며, glob 패턴을 사용할 수 있음.
+#  보고서 파일은 _dataset과 같은 위치의 report 디렉토리에 저장되므로 "../report/..."로 적는다)
+STAGES = {
+    "collect_living_population_dong": {
+        "func": "data_collector:collect_living_population_dong",
+        "deps": [],
+        "inputs": [],
+        "outputs": [
+            "생활인구/생활인구_행정동_코드_raw.csv",
+            "생활인구/생활인구_데이터_*_행정동_raw.csv",
+        ],
+    },
+    "collect_living_migration_dong": {
+        "func": "data_collector:collect_living_migration_dong",
+        "deps": [],
+        "inputs": [],
+        "outputs": [
+            "생활이동/생활이동_행정동_코드_raw.csv",
+            "생활이동/생활이동_데이터_*_행정동_raw",
+        ],
+    },
+    "collect_latest_dong_code": {
+        "func": "data_collector:collect_latest_dong_code",
+        "deps": [],
+        "inputs": [],
+        "outputs": ["행정동/행정동_코드_v*.json"],
+    },
+    "collect_dong_boundary": {
+        "func": "data_collector:collect_dong_boundary",
+        "deps": [],
+        "inputs": [],
+        "outputs": ["행정동/행정동_경계_v*.json"],
+    },
+    "collect_youth_housing_in_station_area": {
+        "func": "data_collector:collect_youth_housing_in_station_area",
+        "deps": [],
+        "inputs": [],
+        "outputs": ["청년주택/역세권_청년주택_raw.csv"],
+    },
+    "process_living_population_dong_code": {
+        "func": "analysis_lp_data:process_living_population_dong_code",
+        "deps": ["collect_living_population_dong", "collect_latest_dong_code"],
+        "inputs": [
+            "생활인구/생활인구_행정동_코드_raw.csv",
+            "행정동/행정동_코드_v*.json",
+        ],
+        "outputs": [
+            "생활인구/생활인구_행정동_코드.json",
+            "생활인구/생활인구_행정동_코드_h2s.json",
+            "행정동/행정동_코드_변경.json",
+        ],
+    },
+    "process_living_population_data": {
+        "func": "analysis_lp_data:process_living_population_data",
+        "deps": ["process_living_population_dong_code"],
+        "inputs": [
+            "생활인구/생활인구_행정동_코드_h2s.json",
+            "생활인구/생활인구_데이터_*_행정동_raw.csv",
+            "생활인구/zip/생활인구_데이터_*.zip",
+            "행정동/행정동_코드_v*.json",
+            "행정동/행정동_코드_변경.json",
+        ],
+        "outputs": ["생활인구/생활인구_데이터_*_행정동_clean.csv"],
+    },
+    "sum_living_population_by_dong": {
+        "func": "analysis_lp_data:sum_living_population_by_dong",
+        "deps": ["process_living_population_data"],
+        "inputs": ["생활인구/생활인구_데이터_*_행정동_clean.csv"],
+        "outputs": [
+            "생활인구/생활인구_분석_행정동별_청년_생활인구_합.csv",
+            "생활인구/생활인구_분석_행정동별_청년_생활인구_합.parquet",
+            "생활인구/생활인구_분석_자치구별_청년_생활인구_합.csv",
+            "생활인구/생활인구_분석_행정동별_청년_생활인구_기간별_합.csv",
+            "생활인구/생활인구_분석_자치구별_청년_생활인구_기간별_합.csv",
+        ],
+    },
+    "build_living_population_cube": {
+        "func": "analysis_lp_data:build_living_population_cube",
+        "deps": ["process_living_population_data"],
+        "inputs": ["생활인구/생활인구_데이터_*_행정동_clean.csv"],
+        "outputs": [
+            "생활인구/생활인구_분석_큐브_행정동.parquet",
+            "생활인구/생활인구_분석_큐브_자치구.parquet",
+        ],
+    },
+    "process_living_migration_data": {
+        "func": "analysis_lm_data:process_living_migration_data",
+        "deps": ["collect_living_migration_dong", "collect_latest_dong_code"],
+        "inputs": [
+            "생활이동/생활이동_데이터_*_행정동_raw/**/*.csv",
+            "생활이동/zip/생활이동_데이터_*.zip",
+            "행정동/행정동_코드_v*.json",
+            "행정동/행정동_코드_변경.json",
+        ],
+        "outputs": ["생활이동/생활이동_분석_청년_OD_*.npz"],
+    },
+    "analyze_youth_housing_supply": {
+        "func": "analysis_yh_data:analyze_youth_housing_supply",
+        "deps": [
+            "collect_youth_housing_in_station_area",
+            "build_living_population_cube",
+            "collect_dong_boundary",
+            "collect_latest_dong_code",
+        ],
+        "inputs": [
+            "청년주택/역세권_청년주택_raw.csv",
+            "청년주택/청년주택_주소_좌표.csv",
+            "생활인구/생활인구_분석_큐브_행정동.parquet",
+            "행정동/행정동_경계_v*.json",
+            "행정동/행정동_코드_v*.json",
+        ],
+        "outputs": [
+            "청년주택/역세권_청년주택_행정동.csv",
+            "청년주택/청년주택_분석_행정동별_공급_수요.csv",
+            "청년주택/청년주택_분석_자치구별_공급_수요.csv",
+        ],
+    },
+    "visualize_living_population_by_dong": {
+        "func": "analysis_lp_data:visualize_living_population_by_dong",
+        "deps": ["sum_living_population_by_dong", "collect_dong_boundary"],
+        "inputs": [
+            "생활인구/생활인구_분석_행정동별_청년_생활인구_합.parquet",
+            "행정동/행정동_경계_v*.json",
+        ],
+        "outputs": ["시각화/행정동별_생활인구_수_합.png"],
+    },
+    "export_living_population_layers": {
+        "func": "analysis_lp_data:export_living_population_layers",
+        "deps": ["sum_living_population_by_dong", "collect_dong_boundary"],
+        "inputs": [
+            "생활인구/생활인구_분석_행정동별_청년_생활인구_합.parquet",
+            "생활인구/생활인구_분석_행정동별_청년_생활인구_기간별_합.csv",
+            "행정동/행정동_경계_v*.json",
+        ],
+        "outputs": [
+            "../report/data/행정동_경계.topojson.json",
+            "../report/data/metrics/행정동별_*생활인구_수_합.json",
+        ],
+    },
+}
+
+# 여러 단계를 한 번에 지정하기 위한 묶음
+STAGE_GROUPS = {
+    "collect": [name for name in STAGES if name.startswith("collect_")],
+    "analysis": [name for name in STAGES if not name.startswith("collect_")],
+    "all": list(STAGES),
+}
+
+
+def expand_targets(targets):
+    """단계 또는 묶음 이름을 단계 이름 리스트로 바꾸기"""
+    names = []
+    for target in targets:
+        if target in STAGE_GROUPS:
+            names.extend(STAGE_GROUPS[target])
+        elif target in STAGES:
+            names.append(target)
+        else:
+            raise Exception(f"없는 단계: {target}")
+    return names
+
+
+def resolve_stages(targets, with_deps=False):
+    """실행할 단계 찾기 (STAGES 순서 유지)
+
+    지정한 단계는 모두 포함하고, 선행 단계는 with_deps=True이거나 다음의 경우에만 포함한다.
+    - 수집 단계: 출력 파일이 없을 때
+    - 그 외 단계: 최신 상태가 아니거나, 그 단계의 선행 단계가 포함되었을 때
+    """
+    requested = set(expand_targets(targets))
+    included = {}
+
+    def _include(name):
+        if name not in included:
+            deps = [_include(dep) for dep in STAGES[name]["deps"]]
+            if name in requested or with_deps:
+                included[name] = True
+            elif is_collector(name):
+                included[name] = not has_outputs(name)
+            else:
+                included[name] = any(deps) or not is_up_to_date(name)
+        return included[name]
+
+    for name in requested:
+        _include(name)
+    return [name for name in STAGES if included.get(name)]
+
+
+def _expand(patterns):
+    """_dataset 기준 파일 패턴에 해당하는 파일 경로 찾기
+
+    Returns:
+        패턴별 파일 경로 리스트의 리스트
+    """
+    return [
+        glob.glob(os.path.join(utils.DATA_DIR, pattern), recursive=True)
+        for pattern in patterns
+    ]
+
+
+def is_collector(name):
+    """입력 파일 없이 외부에서 데이터를 받아 오는 수집 단계인지 확인하기"""
+    return len(STAGES[name]["inputs"]) == 0
+
+
+def has_outputs(name):
+    """단계의 출력 파일 패턴마다 파일이 하나 이상 있는지 확인하기"""
+    outputs = _expand(STAGES[name]["outputs"])
+    return len(outputs) > 0 and all(len(paths) > 0 for paths in outputs)
+
+
+def is_up_to_date(name):
+    """단계의 출력 파일이 모두 있고, 입력 파일보다 최신인지 확인하기
+
+    수집 단계는 새로 공개된 달이 있는지 파일 시각으로 알 수 없으므로 최신으로 보지 않는다.
+    (이미 받은 달을 건너뛰는 것은 각 수집 함수와 manifest가 판단)
+    """
+    if is_collector(name) or not has_outputs(name):
+        return False
+    outputs = _expand(STAGES[name]["outputs"])
+    inputs = [path for paths in _expand(STAGES[name]["inputs"]) for path in paths]
+    if len(inputs) == 0:
+        return True
+    oldest_output = min(os.path.getmtime(p) for paths in outputs for p in paths)
+    newest_input = max(os.path.getmtime(p) for p in inputs)
+    return oldest_output >= newest_input
+
+
+def run_stage(name, force=False):
+    """단계 하나 실행하기 (worker 프로세스에서 모듈을 import)
+
+    force=True이면 force 인자를 받는 단계에도 넘겨서, 수집 기록상 처리된 달도 다시 처리하게 한다.
+
+    Returns:
+        실행에 걸린 시간(초)
+    """
+    module_name, func_name = STAGES[name]["func"].split(":")
+    func = getattr(importlib.import_module(module_name), func_name)
+    kwargs = {}
+    if force and "force" in inspect.signature(func).parameters:
+        kwargs["force"] = True
+    start = time.perf_counter()
+    func(**kwargs)
+    return time.perf_counter() - start
+
+
+def run_pipeline(
+    targets=("all",),
+    force=False,
+    max_workers=None,
+    executor="process",
+    with_deps=False,
+):
+    """선행 관계를 지키면서, 서로 독립적인 단계는 동시에 실행하기
+
+    출력 파일이 입력 파일보다 최신인 단계는 건너뛴다.
+    force=True이면 지정한 단계(targets)만 최신 상태여도 다시 실행하고, force 인자를 넘긴다.
+    선행 단계를 포함하는 기준은 resolve_stages() 참고.
+    실패한 단계에 의존하는 단계는 실행하지 않는다.
+
+    Returns:
+        {단계 이름: "done" | "skipped" | "failed" | "blocked"}
+    """
+    names = resolve_stages(targets, with_deps=with_deps)
+    forced = set(expand_targets(targets)) if force else set()
+    status = {}
+    pool_class = {"process": ProcessPoolExecutor, "thread": ThreadPoolExecutor}
+    with pool_class[executor](max_workers=max_workers) as pool:
+        running = {}
+        while len(status) < len(names):
+            for name in names:
+                if name in status or name in running.values():
+                    continue
+                # 실행 대상에 없는 선행 단계는 이미 준비된 것으로 봄
+                deps = [status.get(dep) for dep in STAGES[name]["deps"] if dep in names]
+                if any(dep in ("failed", "blocked") for dep in deps):
+                    status[name] = "blocked"
+                    LOGGER.info(f"[pipeline] 실행 불가 (선행 단계 실패) - {name}")
+                elif all(dep in ("done", "skipped") for dep in deps):
+                    if name not in forced and is_up_to_date(name):
+                        status[name] = "skipped"
+                        LOGGER.info(f"[pipeline] 건너뜀 (최신 상태) - {name}")
+                    else:
+                        LOGGER.info(f"[pipeline] 실행 - {name}")
+                        running[pool.submit(run_stage, name, name in forced)] = name
+            if len(running) == 0:
+                continue
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                try:
+                    seconds = future.result()
+                except Exception as e:
+                    status[name] = "failed"
+                    LOGGER.error(f"[pipeline] 실패 - {name}: {e}")
+                else:
+                    status[name] = "done"
+                    LOGGER.info(f"[pipeline] 완료 - {name} ({seconds:.1f}초)")
+    return status
+
+
+def main(argv=None):
+    """파이프라인 실행 CLI"""
+    parser = argparse.ArgumentParser(description="서울 청년 주택 분석 파이프라인")
+    parser.add_argument(
+        "targets",
+        nargs="*",
+        default=["all"],
+        help=f"실행할 단계 또는 묶음 ({', '.join(STAGE_GROUPS)})",
+    )
+    parser.add_argument("--force", action="store_true", help="지정한 단계는 최신 상태여도 다시 실행")
+    parser.add_argument(
+        "--with-deps",
+        action="store_true",
+        help="선행 단계도 모두 실행 대상에 포함 (수집 단계 포함)",
+    )
+    parser.add_argument("--workers", type=int, default=None, help="동시에 실행할 단계 수")
+    parser.add_argument("--executor", choices=["process", "thread"], default="process")
+    parser.add_argument("--list", action="store_true", help="단계 목록 출력")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help=f"단계별 cProfile 결과를 {utils.PROFILE_DIR}에 저장",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=utils.ENGINES,
+        default=None,
+        help="집계 실행 방식 (arrow: 메모리보다 큰 데이터를 나누어 읽으며 집계)",
+    )
+    args = parser.parse_args(argv)
+    # worker 프로세스에도 전달되도록 환경 변수로 설정
+    if args.profile:
+        os.environ[utils.PROFILE_ENV] = "1"
+    if args.engine is not None:
+        os.environ[utils.ENGINE_ENV] = args.engine
+
+    if args.list:
+        for name in resolve_stages(args.targets, with_deps=args.with_deps):
+            deps = ", ".join(STAGES[name]["deps"])
+            state = "최신" if is_up_to_date(name) else "실행 필요"
+            print(f"{name} [{state}] <- {deps}")
+        return
+
+    status = run_pipeline(
+        args.targets,
+        force=args.force,
+        max_workers=args.workers,
+        executor=args.executor,
+        with_deps=args.with_deps,
+    )
+    if any(s in ("failed", "blocked") for s in status.values()):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+// 행정동 경계(TopoJSON)와 지표({행정동 코드: 값} JSON)를 불러와 브라우저에서 합친 뒤 Leaflet 지도로 그리기
+// (파일은 analysis_lp_data.export_living_population_layers()로 만든다)
+//
+// 사용법: <div class="dong-map" data-metric="행정동별_생활인구_수_합"
+//             data-fallback="./vis_html/행정동별_생활인구_수_합.html"></div>
+//        fetch()를 쓰므로 웹 서버로 열어야 한다. (예: python -m http.server -d report)
+//        파일을 불러오지 못하면(file://로 연 경우, 아직 만들지 않은 경우) data-fallback의 folium 지도를 보여준다.
+
+const BOUNDARY_URL = "./data/행정동_경계.topojson.json";
+const METRIC_URL = (name) => `./data/metrics/${encodeURIComponent(name)}.json`;
+const SEOUL_CENTER = [37.541, 126.986];
+// folium choropleth(fill_color="YlOrRd", bins=253)와 같은 색과 구간
+// (branca.utilities.color_brewer처럼 YlOrRd 9단계 색을 253개로 보간한다)
+const YLORRD = ["#ffffcc", "#ffeda0", "#fed976", "#feb24c", "#fd8d3c", "#fc4e2a", "#e31a1c", "#bd0026", "#800026"];
+const N_BINS = 253;
+const COLORS = linearGradient(YLORRD, N_BINS);
+
+// 경계는 페이지의 모든 지도가 함께 쓰므로 한 번만 불러온다
+let boundaryPromise = null;
+
+function loadBoundary() {
+    if (boundaryPromise === null) {
+        boundaryPromise = fetchJson(BOUNDARY_URL).then((topology) => topojson.feature(topology, topology.objects.dong));
+    }
+    return boundaryPromise;
+}
+
+async function fetchJson(url) {
+    const response = await fetch(url);
+    if (!response.ok) {
+        throw new Error(`${url}: ${response.status}`);
+    }
+    return response.json();
+}
+
+function linearGradient(hexList, nColors) {
+    // branca.utilities.linear_gradient와 같은 방법: 이웃한 색 사이를 765단계로 보간한 뒤 nColors개 고르기
+    const N_INTERPOLATE = 765;
+    const scale = (start, finish, i) => {
+        const a = parseInt(start, 16);
+        const b = parseInt(finish, 16);
+        return Math.trunc(a + (i / (N_INTERPOLATE - 1)) * (b - a))
+            .toString(16)
+            .padStart(2, "0");
+    };
+    const allColors = [];
+    for (let j = 0; j < hexList.length - 1; j += 1) {
+        const [start, end] = [hexList[j], hexList[j + 1]];
+        for (let i = 0; i < N_INTERPOLATE; i += 1) {
+            const rgb = [1, 3, 5].map((k) => scale(start.slice(k, k + 2), end.slice(k, k + 2), i));
+            allColors.push(`#${rgb.join("")}`);
+        }
+    }
+    return Array.from({ length: nColors }, (_, counter) => {
+        const index = Math.trunc((counter / (nColors - 1)) * (allColors.length - 1));
+        return allColors[index];
+    });
+}
+
+function getBins(values) {
+    // numpy.histogram(bins=253)처럼 최솟값 ~ 최댓값을 같은 간격으로 나눈 경계 (0은 값 없음으로 봄)
+    const real = values.filter((value) => value !== 0);
+    const min = Math.min(...real);
+    const max = Math.max(...real);
+    const step = (max - min) / N_BINS;
+    return Array.from({ length: N_BINS + 1 }, (_, i) => min + step * i);
+}
+
+function getColor(value, bins) {
+    if (value === undefined || value === 0) {
+        return "white";
+    }
+    // 마지막 구간은 최댓값을 포함한다
+    let i = 0;
+    while (i < N_BINS - 1 && value >= bins[i + 1]) {
+        i += 1;
+    }
+    return COLORS[i];
+}
+
+function addLegend(map, name, bins) {
+    // folium 범례처럼 연속 색 막대와 최솟값, 최댓값 표시
+    const legend = L.control({ position: "topright" });
+    legend.onAdd = () => {
+        const div = L.DomUtil.create("div", "dong-map-legend");
+        const min = Math.round(bins[0]).toLocaleString();
+        const max = Math.round(bins[bins.length - 1]).toLocaleString();
+        div.innerHTML =
+            `<b>${name}</b><br>` +
+            `<span class="dong-map-legend-bar" style="background:linear-gradient(to right, ${YLORRD.join(", ")})"></span><br>` +
+            `<span>${min}</span><span style="float:right">${max}</span>`;
+        return div;
+    };
+    legend.addTo(map);
+}
+
+function showFallback(element, error) {
+    // 경계, 지표 파일이나 지도 library를 불러오지 못하면 folium으로 만든 html 지도로 대신 보여주기
+    console.warn(`지도 데이터를 불러오지 못함 (${error}) - folium 지도로 대체`);
+    if (element.dataset.fallback) {
+        const iframe = document.createElement("iframe");
+        iframe.src = element.dataset.fallback;
+        element.replaceWith(iframe);
+    }
+}
+
+async function drawDongMap(element) {
+    const [boundary, metric] = await Promise.all([
+        loadBoundary(),
+        fetchJson(METRIC_URL(element.dataset.metric)),
+    ]);
+    const values = metric.values;
+    const bins = getBins(Object.values(values));
+
+    const map = L.map(element).setView(SEOUL_CENTER, 11);
+    L.tileLayer("https://{s}.basemaps.cartocdn.com/light_all/{z}/{x}/{y}{r}.png", {
+        attribution: "&copy; OpenStreetMap contributors &copy; CARTO",
+    }).addTo(map);
+
+    L.geoJSON(boundary, {
+        style: (feature) => ({
+            fillColor: getColor(values[feature.id], bins),
+            fillOpacity: 0.6,
+            color: "black",
+            weight: 0.3,
+        }),
+        onEachFeature: (feature, layer) => {
+            const value = values[feature.id];
+            const label = value === undefined ? "-" : value.toLocaleString();
+            layer.bindTooltip(
+                `행정동: ${feature.properties.dong_name}<br>${metric.alias} ${label}`
+            );
+            layer.on("mouseover", () => layer.setStyle({ weight: 3, fillColor: "grey" }));
+            layer.on("mouseout", () =>
+                layer.setStyle({ weight: 0.3, fillColor: getColor(value, bins) })
+            );
+        },
+    }).addTo(map);
+    addLegend(map, metric.name, bins);
+}
+
+document.addEventListener("DOMContentLoaded", () => {
+    document.querySelectorAll(".dong-map").forEach((element) => {
+        drawDongMap(element).catch((error) => showFallback(element, error));
+    });
+});
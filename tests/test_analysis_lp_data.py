@@ -0,0 +1,68 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import analysis_lp_data  # noqa: E402
+import utils  # noqa: E402
+import utils_store  # noqa: E402
+
+YEAR_MONTHS = ["202301", "202302"]
+DONGS = [
+    ("서울특별시 마포구 서교동", "11440660"),
+    ("서울특별시 마포구 합정동", "11440680"),
+    ("서울특별시 강남구 역삼1동", "11680640"),
+]
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """년월 2개, 자치구 2개, 파티션마다 파일 2개인 작은 생활인구 저장소 만들기"""
+    monkeypatch.setattr(utils, "DATA_DIR", str(tmp_path / "_dataset"))
+    rng = np.random.default_rng(0)
+    for ym in YEAR_MONTHS:
+        rows = [
+            (int(f"{ym}{day:02d}"), hour, name, code)
+            for day in range(1, 4)
+            for hour in range(24)
+            for name, code in DONGS
+        ]
+        df = pd.DataFrame(rows, columns=["date", "time", "dong_name", "dong_code"])
+        df["date"] = df["date"].astype("int32")
+        for column in analysis_lp_data.POP_COLUMNS:
+            df[column] = rng.uniform(0, 1000, len(df)).astype("float32")
+        # 행정동 코드가 비어 있는 row는 두 engine 모두 제외해야 함
+        df.loc[0, "dong_code"] = None
+        half = len(df) // 2
+        utils_store.write_living_population(df.iloc[:half], f"{ym}-0")
+        utils_store.write_living_population(df.iloc[half:], f"{ym}-1")
+    return tmp_path
+
+
+@pytest.mark.parametrize("year_month", YEAR_MONTHS)
+def test_sum_month_engines_match(store, year_month):
+    """sum_month()는 engine과 상관없이 같은 결과"""
+    expected = analysis_lp_data.sum_month(year_month, engine="pandas")
+    result = analysis_lp_data.sum_month(year_month, engine="arrow")
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_cube_engines_match(store):
+    """집계 큐브는 engine과 상관없이 같은 값 (row 순서만 다를 수 있음)"""
+    cubes = {}
+    for engine in ("pandas", "arrow"):
+        analysis_lp_data.build_living_population_cube(engine=engine)
+        for level, level_name in [("dong", "행정동"), ("gu", "자치구")]:
+            file_path = utils.check_path("생활인구", f"생활인구_분석_큐브_{level_name}.parquet")
+            keys = analysis_lp_data.CUBE_KEYS[level]
+            cube = pd.read_parquet(file_path)
+            cube = cube.sort_values(keys).reset_index(drop=True)
+            cubes[engine, level] = cube
+
+    for level in ("dong", "gu"):
+        expected, result = cubes["pandas", level], cubes["arrow", level]
+        pd.testing.assert_frame_equal(result, expected, check_categorical=False)
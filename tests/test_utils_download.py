@@ -0,0 +1,143 @@
+import hashlib
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import utils_download  # noqa: E402
+
+
+class FileServer:
+    """ETag, Range, If-Range, If-None-Match를 지원하는 테스트용 파일 서버"""
+
+    def __init__(self, payload, etag):
+        self.payload = payload
+        self.etag = etag
+        # 남은 횟수만큼 응답을 중간에 끊음
+        self.truncate = 0
+        # 받은 요청의 헤더 리스트
+        self.requests = []
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                server.requests.append(dict(self.headers))
+                if self.headers.get("If-None-Match") == server.etag:
+                    self.send_response(304)
+                    self.send_header("ETag", server.etag)
+                    self.end_headers()
+                    return
+
+                start = 0
+                range_header = self.headers.get("Range")
+                if_range = self.headers.get("If-Range")
+                if range_header and if_range in (None, server.etag):
+                    start = int(range_header[len("bytes=") : -1])
+                body = server.payload[start:]
+
+                self.send_response(206 if start > 0 else 200)
+                self.send_header("ETag", server.etag)
+                self.send_header("Content-Length", str(len(body)))
+                if start > 0:
+                    total = len(server.payload)
+                    self.send_header(
+                        "Content-Range", f"bytes {start}-{total - 1}/{total}"
+                    )
+                self.end_headers()
+                if server.truncate > 0:
+                    server.truncate -= 1
+                    self.wfile.write(body[: len(body) // 2])
+                    self.wfile.flush()
+                    self.close_connection = True
+                    return
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/file"
+
+    def __enter__(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def payload():
+    # 끊긴 응답에서도 일부가 part 파일에 쓰이도록 CHUNK_SIZE보다 크게
+    return os.urandom(utils_download.CHUNK_SIZE * 3)
+
+
+def download(server, save_path, **kwargs):
+    return utils_download.download_file(
+        server.url, save_path, method="get", backoff=0, timeout=5, **kwargs
+    )
+
+
+def test_resume_and_revalidate(tmp_path, payload):
+    """끊긴 다운로드를 If-Range로 이어받고, 다시 받을 때 304면 파일을 그대로 두기"""
+    save_path = str(tmp_path / "file.bin")
+    sha256 = hashlib.sha256(payload).hexdigest()
+
+    with FileServer(payload, '"v1"') as server:
+        server.truncate = 1
+        result = download(server, save_path, sha256=sha256)
+
+        assert result["sha256"] == sha256
+        assert not result["not_modified"]
+        with open(save_path, "rb") as f:
+            assert f.read() == payload
+        assert not os.path.exists(f"{save_path}.part")
+        assert not os.path.exists(f"{save_path}.part.validator")
+
+        # 두 번째 요청은 받은 만큼 건너뛰고, 같은 파일인지 ETag로 확인
+        resumed = server.requests[1]
+        offset = int(resumed["Range"][len("bytes=") : -1])
+        assert 0 < offset <= len(payload) // 2
+        assert resumed["If-Range"] == '"v1"'
+
+        result = download(server, save_path, headers={"If-None-Match": '"v1"'})
+        assert result["not_modified"]
+        with open(save_path, "rb") as f:
+            assert f.read() == payload
+
+
+def test_resume_changed_file(tmp_path, payload):
+    """이어받기 전에 서버의 파일이 바뀌었으면 part 파일을 버리고 처음부터 받기"""
+    save_path = str(tmp_path / "file.bin")
+    with open(f"{save_path}.part", "wb") as f:
+        f.write(payload[:1000])
+    with open(f"{save_path}.part.validator", "w", encoding="utf-8") as f:
+        f.write('"v1"')
+
+    new_payload = payload[::-1]
+    with FileServer(new_payload, '"v2"') as server:
+        result = download(server, save_path)
+
+    assert result["size"] == len(new_payload)
+    with open(save_path, "rb") as f:
+        assert f.read() == new_payload
+
+
+def test_part_without_validator(tmp_path, payload):
+    """validator가 없는 part 파일은 이어받지 않기"""
+    save_path = str(tmp_path / "file.bin")
+    with open(f"{save_path}.part", "wb") as f:
+        f.write(b"x" * 1000)
+
+    with FileServer(payload, '"v1"') as server:
+        download(server, save_path)
+
+    assert "Range" not in server.requests[0]
+    with open(save_path, "rb") as f:
+        assert f.read() == payload
@@ -1,11 +1,41 @@
+import contextlib
+import cProfile
+import datetime
+import functools
 import json
 import logging
 import os
+import pickle
+import threading
+import time
+import zipfile
 
-import pandas as pd
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
 
 DATA_DIR = os.path.join(os.path.abspath("."), "_dataset")
 
+# 단계별 측정 기록(JSON lines) 파일, cProfile 결과 디렉토리
+METRICS_PATH = "main_metrics.jsonl"
+PROFILE_DIR = "profile"
+# 환경 변수 값이 "1"이면 단계마다 cProfile 결과를 저장 (pipeline --profile)
+PROFILE_ENV = "SEOUL_YOUTH_PROFILE"
+# 집계 실행 방식 ("pandas": 메모리에서 처리, "arrow": pyarrow로 파일을 나누어 읽으며 처리)
+ENGINES = ("pandas", "arrow")
+# 환경 변수로 집계 실행 방식 지정 (pipeline --engine)
+ENGINE_ENV = "SEOUL_YOUTH_ENGINE"
+# 측정 항목 중 누적되는 값
+METRIC_COUNTERS = ("rows_in", "rows_out", "bytes_downloaded", "cache_hits")
+
+# 파일 이름 끝의 압축 확장자 → pandas 압축 방식
+COMPRESSION_EXTS = {"gz": "gzip", "bz2": "bz2", "xz": "xz", "zst": "zstd"}
+
+_METRICS_LOCAL = threading.local()
+_METRICS_LOCK = threading.Lock()
+_ROOT_RECORDS = []
+
 
 def check_path(*paths):
     """경로에 사용되는 디렉토리가 존재하는지 확인 후, 없다면 새로 생성하기"""
@@ -23,22 +53,84 @@ def check_path(*paths):
     return full_path
 
 
-def save_data(file_path, data, encoding="utf-8"):
-    """확장자에 따라, data를 file_path에 저장하기"""
-    ext = file_path.split(".")[-1]
-    if ext == "json":
-        with open(file_path, "w", encoding=encoding) as jf:
-            json.dump(data, jf, indent="\t", ensure_ascii=False)
-    elif ext == "csv":
-        data.to_csv(file_path, encoding=encoding, index=False)
+def get_file_format(file_path):
+    """파일 이름에서 저장 형식과 압축 방식 가져오기 (예: "a.csv.gz" → ("csv", "gzip"))"""
+    exts = os.path.basename(file_path).split(".")[1:]
+    compression = None
+    if len(exts) > 1 and exts[-1] in COMPRESSION_EXTS:
+        compression = COMPRESSION_EXTS[exts.pop()]
+    ext = exts[-1] if len(exts) > 0 else ""
+    return ext, compression
+
+
+def save_data(file_path, data, encoding="utf-8", append=False, compression=None):
+    """확장자에 따라, data를 file_path에 저장하기 (csv는 append=True이면 header 없이 이어 쓰기)
+
+    - json, txt, csv(.gz 등 압축 확장자 가능), parquet, feather(arrow), msgpack, pkl 지원
+    - parquet, feather는 dtype이 그대로 보존되며, compression으로 압축 방식(예: "zstd")을 정한다.
+    - 임시 파일에 쓴 뒤 이름을 바꾸므로, 다른 단계에서 쓰다 만 파일을 읽는 일이 없다.
+      (csv 이어 쓰기는 제외)
+    """
+    ext, file_compression = get_file_format(file_path)
+    if ext == "csv" and append:
+        data.to_csv(
+            file_path,
+            encoding=encoding,
+            index=False,
+            mode="a",
+            header=False,
+            compression=file_compression,
+        )
+        return
+
+    dir_path, file_name = os.path.split(file_path)
+    tmp_path = os.path.join(
+        dir_path, f".{file_name}.{os.getpid()}-{threading.get_ident()}.tmp"
+    )
+    try:
+        if ext == "json":
+            with open(tmp_path, "w", encoding=encoding) as jf:
+                json.dump(data, jf, indent="\t", ensure_ascii=False)
+        elif ext == "txt":
+            with open(tmp_path, "w", encoding=encoding) as f:
+                f.write(data)
+        elif ext == "csv":
+            data.to_csv(
+                tmp_path, encoding=encoding, index=False, compression=file_compression
+            )
+        elif ext == "parquet":
+            data.to_parquet(tmp_path, index=False, compression=compression or "snappy")
+        elif ext in ("feather", "arrow"):
+            data.reset_index(drop=True).to_feather(tmp_path, compression=compression)
+        elif ext == "msgpack":
+            import msgpack
+
+            with open(tmp_path, "wb") as f:
+                f.write(msgpack.packb(data, use_bin_type=True))
+        elif ext == "pkl":
+            with open(tmp_path, "wb") as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        else:
+            raise Exception(f"지원하지 않는 파일 형식: {file_path}")
+        os.replace(tmp_path, file_path)
+    finally:
+        if os.path.isfile(tmp_path):
+            os.remove(tmp_path)
+
 
+def load_data(file_path, encoding="utf-8", columns=None, memory_map=True):
+    """확장자에 따라, file_path에 저장된 데이터 불러오기
 
-def load_data(file_path, encoding="utf-8"):
-    """확장자에 따라, file_path에 저장된 데이터 불러오기"""
+    parquet, feather는 columns로 필요한 column만 읽을 수 있고,
+    feather(arrow)는 memory_map=True이면 파일을 메모리에 올리지 않고 mmap으로 읽는다.
+    """
     if not os.path.isfile(file_path):
         raise Exception(f'파일 없음: "{file_path}"')
 
-    ext = file_path.split(".")[-1]
+    # pandas는 import가 느리므로, 표 형식 파일을 읽을 때만 불러온다 (pipeline CLI 등)
+    import pandas as pd
+
+    ext, _ = get_file_format(file_path)
     if ext == "json":
         with open(file_path, "r", encoding=encoding) as jf:
             data = json.load(jf)
@@ -49,9 +141,77 @@ def load_data(file_path, encoding="utf-8"):
             data = f.read()
     elif ext == "xlsx":
         data = pd.read_excel(file_path)
+    elif ext == "parquet":
+        data = pd.read_parquet(file_path, columns=columns)
+    elif ext in ("feather", "arrow"):
+        from pyarrow import feather
+
+        table = feather.read_table(file_path, columns=columns, memory_map=memory_map)
+        data = table.to_pandas()
+    elif ext == "msgpack":
+        import msgpack
+
+        with open(file_path, "rb") as f:
+            data = msgpack.unpackb(f.read(), raw=False, strict_map_key=False)
+    elif ext == "pkl":
+        with open(file_path, "rb") as f:
+            data = pickle.load(f)
+    else:
+        raise Exception(f"지원하지 않는 파일 형식: {file_path}")
     return data
 
 
+def get_engine(engine=None):
+    """집계 실행 방식 가져오기 (없으면 환경 변수 SEOUL_YOUTH_ENGINE, 그것도 없으면 "pandas")"""
+    engine = os.environ.get(ENGINE_ENV, ENGINES[0]) if engine is None else engine
+    if engine not in ENGINES:
+        raise Exception(f"지원하지 않는 실행 방식: {engine}")
+    return engine
+
+
+def get_zip_member_name(info):
+    """zip 파일 안의 파일 이름 가져오기 (UTF-8 표시가 없는 이름은 cp437 → euc-kr로 복원)"""
+    if info.flag_bits & 0x800:
+        return info.filename
+    try:
+        return info.filename.encode("cp437").decode("euc-kr")
+    except UnicodeError:
+        return info.filename
+
+
+def iter_zip_members(zip_path, suffix=".csv"):
+    """zip 파일을 풀지 않고, 이름이 suffix로 끝나는 파일을 하나씩 열기
+
+    Yields:
+        (파일 이름, 압축을 풀면서 읽는 binary 파일 객체)
+    """
+    with zipfile.ZipFile(zip_path) as zf:
+        for info in zf.infolist():
+            name = get_zip_member_name(info)
+            if info.is_dir() or not name.endswith(suffix):
+                continue
+            with zf.open(info) as f:
+                yield name, f
+
+
+def get_peak_rss_mb():
+    """현재 프로세스의 최대 메모리 사용량(RSS, MB) 가져오기
+
+    ru_maxrss는 exec 이후에도 부모 프로세스의 값이 남아 있으므로, 가능하면 /proc의 VmHWM을 사용한다.
+    둘 다 없는 운영체제(Windows)에서는 nan을 반환한다.
+    """
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if resource is None:
+        return float("nan")
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
 def set_logger():
     """로그 기록을 위해 로거(logger) 설정하기"""
     logger = logging.getLogger()
@@ -74,3 +234,124 @@ def set_logger():
     f_handler.setFormatter(formatter)
     logger.addHandler(f_handler)
     return logger
+
+
+def reset_peak_rss():
+    """최대 메모리 사용량(VmHWM)을 현재 값으로 초기화하기 (지원하지 않으면 무시)"""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def current_metrics():
+    """현재 thread에서 측정 중인 가장 안쪽 단계의 기록 가져오기 (없으면 None)"""
+    stack = getattr(_METRICS_LOCAL, "stack", [])
+    return stack[-1] if len(stack) > 0 else None
+
+
+def add_metric(name, value):
+    """측정 중인 단계의 기록에 값 더하기 (예: add_metric("rows_in", len(df)))
+
+    측정을 시작하지 않은 thread(예: 다운로드 worker)에서 호출하면, 프로세스에서 측정 중인
+    단계가 하나뿐일 때 그 단계의 기록에 더한다.
+    """
+    record = current_metrics()
+    with _METRICS_LOCK:
+        if record is None and len(_ROOT_RECORDS) == 1:
+            record = _ROOT_RECORDS[0]
+        if record is not None:
+            record[name] = record.get(name, 0) + value
+
+
+def write_metrics(record):
+    """측정 기록을 JSON lines 파일에 추가하기"""
+    line = json.dumps(record, ensure_ascii=False)
+    with _METRICS_LOCK:
+        with open(METRICS_PATH, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+@contextlib.contextmanager
+def measure(stage, profile=None):
+    """with 블록의 실행 시간, 처리 row 수, 다운로드 크기, 최대 메모리 사용량 측정하기
+
+    블록이 끝나면 기록을 METRICS_PATH에 JSON 한 줄로 남긴다. 블록 안에서는 add_metric()으로
+    rows_in, rows_out, bytes_downloaded 등을 더할 수 있다.
+    profile=True이면 (환경 변수 SEOUL_YOUTH_PROFILE=1이어도) cProfile 결과를 PROFILE_DIR에 저장한다.
+
+    Yields:
+        측정 기록 dict
+    """
+    stack = _METRICS_LOCAL.__dict__.setdefault("stack", [])
+    record = {
+        "stage": stage,
+        "started_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "pid": os.getpid(),
+        **{name: 0 for name in METRIC_COUNTERS},
+    }
+    is_root = len(stack) == 0
+    profile = os.environ.get(PROFILE_ENV) == "1" if profile is None else profile
+
+    profiler = None
+    if is_root:
+        reset_peak_rss()
+        with _METRICS_LOCK:
+            _ROOT_RECORDS.append(record)
+        if profile:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:  # 다른 thread에서 profiler가 실행 중인 경우
+                profiler = None
+    stack.append(record)
+
+    start = time.perf_counter()
+    record["status"] = "error"
+    try:
+        yield record
+        record["status"] = "ok"
+    except BaseException as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        record["seconds"] = round(time.perf_counter() - start, 3)
+        record["peak_rss_mb"] = round(get_peak_rss_mb(), 1)
+        stack.pop()
+        if is_root:
+            with _METRICS_LOCK:
+                _ROOT_RECORDS.remove(record)
+        else:
+            # 안쪽 단계의 누적 값은 바깥 단계에도 더하기
+            for name in METRIC_COUNTERS:
+                add_metric(name, record[name])
+
+        if profiler is not None:
+            profiler.disable()
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
+            profile_path = os.path.join(
+                PROFILE_DIR, f"{stage}_{timestamp}_{os.getpid()}.prof"
+            )
+            profiler.dump_stats(profile_path)
+            record["profile_path"] = profile_path
+
+        write_metrics(record)
+        logging.getLogger().info(
+            f"[metrics] {stage} ({record['status']}) - {record['seconds']}초, "
+            f"rows {record['rows_in']:,} → {record['rows_out']:,}, "
+            f"다운로드 {record['bytes_downloaded']:,} bytes, "
+            f"최대 메모리 {record['peak_rss_mb']}MB"
+        )
+
+
+def instrument(func):
+    """함수 실행을 measure()로 측정하는 decorator (측정 이름 = 함수 이름)"""
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with measure(func.__name__):
+            return func(*args, **kwargs)
+
+    return wrapper
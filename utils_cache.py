@@ -0,0 +1,262 @@
+import ast
+import collections
+import functools
+import glob
+import hashlib
+import inspect
+import os
+import pickle
+import sys
+import threading
+
+import utils
+
+LOGGER = utils.set_logger()
+
+# 메모리 캐시 최대 크기 (이보다 커지면 가장 오래 사용하지 않은 결과부터 버림)
+CACHE_MEMORY_BYTES = 1024 * 1024 * 1024
+# 디스크 캐시 최대 크기 (이보다 커지면 가장 오래 사용하지 않은 파일부터 삭제)
+CACHE_DISK_BYTES = 4 * 1024 * 1024 * 1024
+# 환경 변수 값이 "1"이면 캐시를 사용하지 않음
+CACHE_DISABLE_ENV = "SEOUL_YOUTH_NO_CACHE"
+# 결과 형식이 바뀌는 등 모든 캐시를 한 번에 무효화해야 할 때 올리는 버전
+CACHE_VERSION = 1
+
+# 소스 코드 해시에 포함하는 프로젝트 모듈의 위치
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 메모리 캐시: {key: (결과, 크기)} (최근에 사용한 것이 뒤쪽)
+_MEMORY = collections.OrderedDict()
+_MEMORY_BYTES = 0
+_LOCK = threading.Lock()
+# 파일 내용 해시 memo: {(경로, 크기, 수정 시각): sha256}
+_FILE_HASHES = {}
+
+
+def get_cache_dir(cache_name):
+    """함수별 디스크 캐시 디렉토리 가져오기 (cache_name: "모듈-함수")"""
+    return utils.check_path("cache", "results", cache_name)
+
+
+def hash_file(file_path):
+    """파일 내용의 sha256 구하기 (크기, 수정 시각이 그대로인 파일은 다시 읽지 않음)"""
+    stat = os.stat(file_path)
+    memo_key = (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+    if memo_key not in _FILE_HASHES:
+        sha256 = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                sha256.update(block)
+        _FILE_HASHES[memo_key] = sha256.hexdigest()
+    return _FILE_HASHES[memo_key]
+
+
+@functools.lru_cache(maxsize=None)
+def get_dependencies(source_path):
+    """소스 파일과, 그 파일이 직접/간접적으로 import하는 프로젝트 모듈 파일 경로 (정렬됨)
+
+    함수 안에서 import하는 모듈(lazy import)까지 포함한다.
+    """
+    found = set()
+    stack = [os.path.abspath(source_path)]
+    while stack:
+        path = stack.pop()
+        if path in found or not os.path.isfile(path):
+            continue
+        found.add(path)
+        with open(path, encoding="utf-8") as f:
+            tree = ast.parse(f.read(), filename=path)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+                names = [node.module]
+            else:
+                continue
+            for name in names:
+                stack.append(os.path.join(PROJECT_DIR, f"{name.split('.')[0]}.py"))
+    return tuple(sorted(found))
+
+
+def hash_source(module_name):
+    """모듈과 그 모듈이 사용하는 프로젝트 모듈 소스 코드의 sha256 구하기 (코드가 바뀌면 캐시도 무효화)"""
+    source_path = inspect.getsourcefile(sys.modules[module_name])
+    sha256 = hashlib.sha256()
+    for path in get_dependencies(source_path):
+        sha256.update(f"{os.path.basename(path)}:{hash_file(path)}\n".encode("utf-8"))
+    return sha256.hexdigest()
+
+
+def get_input_files(patterns):
+    """_dataset 기준 파일 패턴(glob)에 해당하는 파일 경로 리스트 (정렬됨)"""
+    return sorted(
+        path
+        for pattern in patterns
+        for path in glob.glob(os.path.join(utils.DATA_DIR, pattern), recursive=True)
+        if os.path.isfile(path)
+    )
+
+
+def stable_repr(value):
+    """인자를 넘긴 순서와 상관없는 repr 만들기 (dict, set은 안쪽까지 정렬)"""
+    if isinstance(value, dict):
+        items = sorted(f"{stable_repr(k)}: {stable_repr(v)}" for k, v in value.items())
+        return "{" + ", ".join(items) + "}"
+    if isinstance(value, (set, frozenset)):
+        return "{" + ", ".join(sorted(stable_repr(v) for v in value)) + "}"
+    if isinstance(value, (list, tuple)):
+        items = ", ".join(stable_repr(v) for v in value)
+        return f"[{items}]" if isinstance(value, list) else f"({items},)"
+    return repr(value)
+
+
+def make_key(func, args, kwargs, inputs):
+    """캐시 key 만들기 = hash(함수, 인자, 입력 파일 내용, 모듈 소스 코드, CACHE_VERSION)
+
+    **kwargs처럼 dict로 받는 인자는 넘긴 순서와 상관없이 같은 key가 된다.
+    """
+    bound = inspect.signature(func).bind(*args, **kwargs)
+    bound.apply_defaults()
+    parts = [
+        f"{func.__module__}.{func.__qualname__}",
+        stable_repr(dict(bound.arguments)),
+        hash_source(func.__module__),
+        str(CACHE_VERSION),
+    ]
+    for path in get_input_files(inputs):
+        parts.append(f"{os.path.relpath(path, utils.DATA_DIR)}:{hash_file(path)}")
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def get_size(value):
+    """결과가 차지하는 메모리 크기(bytes) 추정하기"""
+    if hasattr(value, "memory_usage"):  # pandas DataFrame, Series
+        size = value.memory_usage(deep=True)
+        return int(size.sum() if hasattr(size, "sum") else size)
+    if hasattr(value, "nbytes"):  # numpy 배열
+        return int(value.nbytes)
+    if isinstance(value, (tuple, list)):
+        return sum(get_size(v) for v in value)
+    return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def _memory_get(key):
+    """메모리 캐시에서 결과 찾기 (찾으면 가장 최근에 사용한 것으로 표시)"""
+    with _LOCK:
+        if key not in _MEMORY:
+            return False, None
+        _MEMORY.move_to_end(key)
+        return True, _MEMORY[key][0]
+
+
+def _memory_put(key, value, max_bytes):
+    """메모리 캐시에 결과 저장하기 (max_bytes를 넘으면 오래 사용하지 않은 결과부터 버림)"""
+    global _MEMORY_BYTES
+    size = get_size(value)
+    if size > max_bytes:
+        return
+    with _LOCK:
+        if key in _MEMORY:
+            _MEMORY_BYTES -= _MEMORY.pop(key)[1]
+        _MEMORY[key] = (value, size)
+        _MEMORY_BYTES += size
+        while _MEMORY_BYTES > max_bytes:
+            _, (_, evicted_size) = _MEMORY.popitem(last=False)
+            _MEMORY_BYTES -= evicted_size
+
+
+def _disk_get(cache_path):
+    """디스크 캐시에서 결과 찾기 (찾으면 수정 시각을 갱신하여 최근 사용으로 표시)"""
+    if not os.path.isfile(cache_path):
+        return False, None
+    try:
+        value = utils.load_data(cache_path)
+    except Exception as e:  # 다른 버전의 라이브러리로 저장된 경우 등
+        LOGGER.info(f"[cache] 디스크 캐시 읽기 실패 ({e}) - {cache_path}")
+        return False, None
+    os.utime(cache_path)
+    return True, value
+
+
+def _disk_put(cache_path, value, max_bytes):
+    """디스크 캐시에 결과 저장하고, max_bytes를 넘으면 오래 사용하지 않은 파일부터 삭제하기"""
+    utils.save_data(cache_path, value)
+
+    pattern = os.path.join(utils.check_path("cache", "results"), "*", "*.pkl")
+    files = []
+    for path in glob.glob(pattern):
+        stat = os.stat(path)
+        files.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in files)
+    for _, size, path in sorted(files):
+        if total <= max_bytes:
+            break
+        if path != cache_path:
+            os.remove(path)
+            total -= size
+
+
+def cached(inputs=(), outputs=(), memory=True, disk=True):
+    """입력 파일 내용과 인자가 같으면, 함수를 다시 실행하지 않고 저장해 둔 결과를 반환하는 decorator
+
+    - 메모리 캐시(같은 프로세스, 예: notebook)를 먼저 찾고, 없으면 디스크 캐시(_dataset/cache)를 찾는다.
+    - 입력 파일(inputs, _dataset 기준 glob 패턴), 인자, 함수가 정의된 모듈과 그 모듈이
+      import하는 프로젝트 모듈의 소스 코드 중 하나라도 바뀌면 다시 실행한다.
+    - outputs(_dataset 기준 glob 패턴)에 해당하는 파일이 없으면 다시 실행한다.
+      (파일을 만드는 함수용)
+    - 메모리 캐시의 결과는 호출한 곳끼리 공유되므로 수정하지 않는다.
+
+    예)
+        @utils_cache.cached(inputs=["행정동/행정동_경계_v*.json"])
+        def process_geo_data(tolerance=0.0001):
+            ...
+    """
+
+    def decorator(func):
+        cache_name = f"{func.__module__}-{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if os.environ.get(CACHE_DISABLE_ENV) == "1":
+                return func(*args, **kwargs)
+            key = make_key(func, args, kwargs, inputs)
+            if disk:
+                cache_path = os.path.join(get_cache_dir(cache_name), f"{key}.pkl")
+
+            found, value = False, None
+            if all(len(get_input_files([pattern])) > 0 for pattern in outputs):
+                if memory:
+                    found, value = _memory_get(key)
+                if not found and disk:
+                    found, value = _disk_get(cache_path)
+                    if found and memory:
+                        _memory_put(key, value, CACHE_MEMORY_BYTES)
+            if found:
+                utils.add_metric("cache_hits", 1)
+                LOGGER.info(f"[cache] 저장된 결과 사용 - {cache_name}")
+                return value
+
+            value = func(*args, **kwargs)
+            if memory:
+                _memory_put(key, value, CACHE_MEMORY_BYTES)
+            if disk:
+                _disk_put(cache_path, value, CACHE_DISK_BYTES)
+            return value
+
+        wrapper.cache_clear = functools.partial(clear_cache, cache_name)
+        return wrapper
+
+    return decorator
+
+
+def clear_cache(cache_name=None):
+    """메모리 캐시를 비우고, 디스크 캐시(cache_name이 있으면 그 함수의 것만)를 삭제하기"""
+    global _MEMORY_BYTES
+    with _LOCK:
+        _MEMORY.clear()
+        _MEMORY_BYTES = 0
+    pattern = os.path.join(
+        utils.check_path("cache", "results"), cache_name or "*", "*.pkl"
+    )
+    for path in glob.glob(pattern):
+        os.remove(path)
@@ -0,0 +1,347 @@
+import functools
+import glob
+import hashlib
+import json
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+import utils
+
+# 행정동 코드 변경 규칙: (과거) 행정동 코드 → [((현재) 행정동 코드, 생활인구 배분 비율), ...]
+DONG_CODE_REMAP = {
+    # (과거) 강남구 일원2동 → (현재) 강남구 개포3동
+    "11230740": [("11230511", 1.0)],
+    # (과거) 강동구 상일동 → (현재) 강동구 상일1동
+    "11250520": [("11250760", 1.0)],
+    # (과거) 강동구 강일동 → (현재) 강동구 강일동, 강동구 상일2동
+    "11250510": [("11250750", 0.5), ("11250770", 0.5)],
+    # (과거) 구로구 오류2동 → (현재) 구로구 오류2동, 구로구 항동
+    "11170680": [("11170730", 0.5), ("11170740", 0.5)],
+}
+
+# 행정동 코드 파일 이름의 버전 (예: 행정동_코드_v2023-07-01.json)
+CODE_VERSION_PATTERN = re.compile(r"행정동_코드_v(\d{4})-(\d{2})-(\d{2})\.json$")
+
+# 행정동 코드 변경 표의 변경 유형
+# (unchanged: 그대로, renamed: 이름만 바뀜, recoded: 코드만 바뀜, split: 분할, merged: 통합,
+#  retired: 대응하는 최신 행정동 없음, added: 새로 생긴 행정동)
+REMAP_CHANGE_TYPES = [
+    "unchanged",
+    "renamed",
+    "recoded",
+    "split",
+    "merged",
+    "retired",
+    "added",
+]
+
+
+def list_code_versions():
+    """저장된 행정동 코드 데이터의 버전 리스트 가져오기 (날짜 순, 오래된 것부터)
+
+    Returns:
+        [(version, 파일 경로), ...]
+    """
+    file_path = os.path.join(utils.check_path("행정동"), "행정동_코드_v*.json")
+    versions = []
+    for path in glob.glob(file_path):
+        match = CODE_VERSION_PATTERN.search(os.path.basename(path))
+        if match is None:
+            continue
+        versions.append(
+            (tuple(int(x) for x in match.groups()), "-".join(match.groups()), path)
+        )
+    return [(version, path) for _, version, path in sorted(versions)]
+
+
+def get_latest_code_version():
+    """가장 최신 버전의 행정동 코드 데이터 버전 가져오기"""
+    versions = list_code_versions()
+    if len(versions) == 0:
+        raise Exception("행정동 코드 데이터 없음")
+    return versions[-1][0]
+
+
+def get_code_path(version=None):
+    """특정 버전(없으면 최신 버전)의 행정동 코드 데이터 경로 가져오기"""
+    version = get_latest_code_version() if version is None else version
+    for v, path in list_code_versions():
+        if v == version:
+            return path
+    raise Exception(f"없는 행정동 코드 버전: {version}")
+
+
+def get_h2s_path():
+    """생활인구 (행자부) 행정동 코드 → (통계청) 행정동 코드 데이터 경로 가져오기"""
+    return utils.check_path("생활인구", "생활인구_행정동_코드_h2s.json")
+
+
+def get_remap_table_path():
+    """행정동 코드 변경 표(과거 행정동 코드 → 최신 행정동 코드) 경로 가져오기"""
+    return utils.check_path("행정동", "행정동_코드_변경.json")
+
+
+def _get_mtime(file_path):
+    """파일 수정 시각 가져오기 (파일이 없으면 None)"""
+    return os.path.getmtime(file_path) if os.path.isfile(file_path) else None
+
+
+def _get_cache_key(version):
+    """색인 캐시 key 만들기 (h2s 파일이나 변경 표가 다시 만들어지면 색인도 다시 만든다)"""
+    version = get_latest_code_version() if version is None else version
+    return version, _get_mtime(get_h2s_path()), _get_mtime(get_remap_table_path())
+
+
+def get_registry(version=None):
+    """행정동 코드 색인 가져오기 (버전별로 한 번만 만든다)
+
+    Returns:
+        {"version", "name2scode", "scode2name", "scode2gu", "hcode2scode", "remap"}
+        (hcode: 행자부 행정동 코드(int), scode: 통계청 행정동 코드(8자리 문자열))
+    """
+    return _build_registry(*_get_cache_key(version))
+
+
+@functools.lru_cache(maxsize=None)
+def _build_registry(version, h2s_mtime, remap_mtime):
+    """행정동 코드 파일들을 읽어 색인 만들기"""
+    name2scode = utils.load_data(get_code_path(version))
+    scode2name = {v: k for k, v in name2scode.items()}
+    scode2gu = {v: k.split()[1] for k, v in name2scode.items()}
+
+    # 생활인구 데이터의 (행자부) 행정동 코드 → (통계청) 행정동 코드
+    hcode2scode = {}
+    h2s_path = get_h2s_path()
+    if h2s_mtime is not None:
+        hcode2scode = {int(k): v for k, v in utils.load_data(h2s_path).items()}
+
+    return {
+        "version": version,
+        "name2scode": name2scode,
+        "scode2name": scode2name,
+        "scode2gu": scode2gu,
+        "hcode2scode": hcode2scode,
+        "remap": _load_dong_code_remap(remap_mtime),
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def _get_index(version, h2s_mtime, remap_mtime, index_name):
+    """색인(dict)을 배열 기반 조회용 pandas Series로 바꾸기"""
+    mapping = _build_registry(version, h2s_mtime, remap_mtime)[index_name]
+    return pd.Series(list(mapping.values()), index=list(mapping.keys()))
+
+
+def lookup(values, index_name, version=None):
+    """column 전체를 색인으로 한 번에 변환하기 (색인에 없는 값은 NaN)
+
+    예) lookup(df["dong_code"], "scode2name") → 행정동 이름 column
+    """
+    index = _get_index(*_get_cache_key(version), index_name)
+    positions = index.index.get_indexer(np.asarray(values))
+    result = index.to_numpy(dtype=object).take(positions)
+    result[positions < 0] = np.nan
+    if isinstance(values, pd.Series):
+        return pd.Series(result, index=values.index, name=values.name)
+    return result
+
+
+def get_dong_codes(version=None):
+    """특정 버전(없으면 최신 버전)의 (통계청) 행정동 코드 리스트 가져오기 (정렬됨)"""
+    return sorted(set(get_registry(version)["name2scode"].values()))
+
+
+def normalize_dong_name(names):
+    """행정동 이름 column 정규화하기 (. → ·, 중복 공백 제거)"""
+    names = pd.Series(names, dtype=str)
+    names = names.str.replace(".", "·", regex=False)
+    return names.str.split().str.join(" ")
+
+
+def load_code_versions(extra=None):
+    """저장된 모든 버전의 행정동 코드 데이터를 하나의 표로 읽기
+
+    Args:
+        extra: 함께 비교할 {버전 이름: {행정동 이름: 행정동 코드}} (예: 생활인구 행정동 코드)
+            저장된 버전보다 오래된 것으로 취급한다.
+
+    Returns:
+        DataFrame (version, rank, code, name, norm_name) - rank가 클수록 최신 버전
+    """
+    name2code_list = list((extra or {}).items())
+    name2code_list += [(v, utils.load_data(path)) for v, path in list_code_versions()]
+    codes_df = pd.concat(
+        [
+            pd.DataFrame(
+                {
+                    "version": version,
+                    "rank": rank,
+                    "code": list(name2code.values()),
+                    "name": list(name2code.keys()),
+                }
+            )
+            for rank, (version, name2code) in enumerate(name2code_list)
+        ],
+        ignore_index=True,
+    )
+    codes_df["code"] = codes_df["code"].astype(str)
+    codes_df["norm_name"] = normalize_dong_name(codes_df["name"]).to_numpy()
+    return codes_df
+
+
+def reconcile_dong_codes(codes_df, target_version=None, rules=None):
+    """모든 버전의 행정동 코드를 기준 버전(없으면 최신 버전)의 행정동 코드와 한 번에 대조하기
+
+    과거 행정동 코드마다 대응하는 기준 행정동 코드를 다음 순서로 찾는다.
+        1. 변경 규칙(rules, 없으면 DONG_CODE_REMAP)에 있으면 규칙대로 (분할은 비율대로)
+        2. 같은 코드가 있으면 그 코드
+        3. 정규화한 이름이 같은 행정동이 있으면 그 코드
+    그리고 대응 관계에 따라 REMAP_CHANGE_TYPES 중 하나로 분류한다.
+
+    Returns:
+        DataFrame (version, old_code, old_name, new_code, new_name, weight, change)
+        (added 행은 old_code, old_name이 NaN, retired 행은 new_code, new_name이 NaN)
+    """
+    rules = DONG_CODE_REMAP if rules is None else rules
+    if target_version is None:
+        target_version = codes_df.loc[codes_df["rank"].idxmax(), "version"]
+    is_target = (codes_df["version"] == target_version).to_numpy()
+    target = codes_df.loc[is_target, ["code", "name", "norm_name"]]
+    target = target.drop_duplicates("code")
+    source = codes_df.loc[~is_target, ["version", "rank", "code", "name", "norm_name"]]
+    source = source.drop_duplicates(["version", "code"])
+
+    # 1. 변경 규칙
+    rules_df = pd.DataFrame(
+        [
+            (old, new, weight)
+            for old, targets in rules.items()
+            for new, weight in targets
+        ],
+        columns=["code", "rule_code", "rule_weight"],
+    )
+    df = source.merge(rules_df, on="code", how="left")
+    # 2. 같은 코드, 3. 같은 이름
+    code2name = target.set_index("code")["name"]
+    name2code = target.drop_duplicates("norm_name").set_index("norm_name")["code"]
+    by_code = df["code"].where(df["code"].isin(code2name.index))
+    by_name = df["norm_name"].map(name2code)
+    df["new_code"] = df["rule_code"].fillna(by_code).fillna(by_name)
+    df["weight"] = df["rule_weight"].fillna(1.0).where(df["new_code"].notna())
+    df["new_name"] = df["new_code"].map(code2name)
+
+    # 분류: 한 코드 → 여러 코드는 분할, 여러 코드 → 한 코드는 통합
+    num_targets = df.groupby(["version", "code"])["new_code"].transform("count")
+    num_sources = df.groupby(["version", "new_code"])["code"].transform("count")
+    same_name = df["norm_name"] == normalize_dong_name(df["new_name"]).to_numpy()
+    df["change"] = np.select(
+        [
+            df["new_code"].isna(),
+            num_targets > 1,
+            num_sources > 1,
+            (df["code"] == df["new_code"]) & same_name,
+            df["code"] == df["new_code"],
+        ],
+        ["retired", "split", "merged", "unchanged", "renamed"],
+        default="recoded",
+    )
+    df = df.rename(columns={"code": "old_code", "name": "old_name"})
+
+    # 과거 버전에 대응하는 행정동이 없는 기준 행정동
+    versions = source[["version", "rank"]].drop_duplicates()
+    added = versions.merge(target, how="cross")
+    mapped = df[["version", "new_code"]].drop_duplicates()
+    added = added.merge(
+        mapped,
+        left_on=["version", "code"],
+        right_on=["version", "new_code"],
+        how="left",
+    )
+    added = added[added["new_code"].isna()]
+    added = added.assign(new_code=added["code"], new_name=added["name"], change="added")
+
+    result = pd.concat([df, added], ignore_index=True)
+    result = result.sort_values(["rank", "old_code", "new_code"], kind="stable")
+    return result[
+        ["version", "old_code", "old_name", "new_code", "new_name", "weight", "change"]
+    ].reset_index(drop=True)
+
+
+def to_dong_code_remap(remap_df):
+    """행정동 코드 변경 표를 remap 규칙 dict로 바꾸기
+
+    코드가 바뀌는 행(recoded, split, merged)만 사용하며, 같은 과거 코드가 여러 버전에 있으면
+    표에서 가장 나중에 나온(최신) 버전의 대응 관계를 쓴다.
+
+    Returns:
+        {과거 행정동 코드: [(최신 행정동 코드, 비율), ...]}
+    """
+    df = remap_df[
+        remap_df["change"].isin(["recoded", "split", "merged"])
+        & (remap_df["old_code"] != remap_df["new_code"])
+    ]
+    df = df[df["version"] == df.groupby("old_code")["version"].transform("last")]
+    remap = {}
+    for old_code, new_code, weight in zip(df["old_code"], df["new_code"], df["weight"]):
+        remap.setdefault(old_code, []).append((new_code, float(weight)))
+    return remap
+
+
+@functools.lru_cache(maxsize=None)
+def _load_dong_code_remap(remap_mtime):
+    """행정동 코드 변경 표 + DONG_CODE_REMAP으로 remap 규칙 만들기 (DONG_CODE_REMAP이 우선)"""
+    remap = {}
+    if remap_mtime is not None:
+        remap_df = pd.DataFrame(utils.load_data(get_remap_table_path()))
+        remap = to_dong_code_remap(remap_df)
+    remap.update(DONG_CODE_REMAP)
+    return dict(sorted(remap.items()))
+
+
+def get_dong_code_remap():
+    """과거 행정동 코드 → 최신 행정동 코드 remap 규칙 가져오기
+
+    process_living_population_dong_code가 만든 행정동 코드 변경 표가 있으면 그 대응 관계를,
+    없으면 DONG_CODE_REMAP만 사용한다.
+    """
+    return _load_dong_code_remap(_get_mtime(get_remap_table_path()))
+
+
+def get_remap_hash(remap=None):
+    """행정동 코드 변경 규칙의 해시 (규칙이 바뀌었는지 확인하는 용도)"""
+    remap = get_dong_code_remap() if remap is None else remap
+    rules = json.dumps(sorted(remap.items()), ensure_ascii=False)
+    return hashlib.sha256(rules.encode("utf-8")).hexdigest()[:16]
+
+
+def remap_dong_code(df, value_columns, remap=None, code_column="dong_code"):
+    """과거 행정동 코드를 최신 행정동 코드로 바꾸고, 분할된 행정동은 value_columns를 비율대로 나누기
+
+    remap 규칙을 표(DataFrame)로 만든 뒤 merge 하므로, 한 행정동이 여러 행정동으로 분할되면
+    해당 row가 새 행정동 개수만큼 복제된다. 규칙에 없는 행정동 코드는 그대로 둔다.
+    (remap이 없으면 get_dong_code_remap()의 규칙을 사용)
+    """
+    remap = get_dong_code_remap() if remap is None else remap
+
+    remap_df = pd.DataFrame(
+        [(old, new, weight) for old, rules in remap.items() for new, weight in rules],
+        columns=[code_column, "_new_code", "_weight"],
+    )
+    df = df.merge(remap_df, on=code_column, how="left")
+
+    matched = df["_new_code"].notna().to_numpy()
+    df.loc[matched, code_column] = df.loc[matched, "_new_code"]
+
+    split = matched & (df["_weight"].to_numpy() != 1.0)
+    if split.any():
+        weight = df.loc[split, "_weight"]
+        dtypes = df.dtypes[value_columns].to_dict()
+        df.loc[split, value_columns] = (
+            df.loc[split, value_columns].mul(weight, axis=0).astype(dtypes)
+        )
+
+    df = df.drop(columns=["_new_code", "_weight"])
+    return df
@@ -0,0 +1,203 @@
+import hashlib
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests as rq
+from requests.adapters import HTTPAdapter
+
+import utils
+
+LOGGER = utils.set_logger()
+
+# 연결 / 읽기 timeout (초)
+DEFAULT_TIMEOUT = (10, 60)
+# 최대 재시도 횟수, 재시도 대기 시간 (backoff * 2 ** 시도 횟수)
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BACKOFF = 1.0
+# 동시 다운로드 개수
+DEFAULT_MAX_WORKERS = 4
+# 파일에 한 번에 쓰는 크기 (bytes)
+CHUNK_SIZE = 1024 * 1024
+
+
+def get_session(pool_size=DEFAULT_MAX_WORKERS):
+    """연결을 재사용하는 requests 세션 만들기"""
+    session = rq.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def file_sha256(file_path):
+    """파일의 sha256 해시 계산하기"""
+    sha256 = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def _get_validator(headers):
+    """part 파일이 같은 파일의 일부인지 확인할 때 쓰는 응답 헤더 값 (ETag, 없으면 Last-Modified)"""
+    return headers.get("ETag") or headers.get("Last-Modified")
+
+
+def _remove_part(part_path):
+    """part 파일과 그 validator 파일 삭제하기"""
+    for path in (part_path, f"{part_path}.validator"):
+        if os.path.isfile(path):
+            os.remove(path)
+
+
+def _request_to_part(session, method, url, part_path, timeout, **kwargs):
+    """응답 본문을 part 파일에 이어 쓰기 (part 파일이 있으면 Range 요청으로 재개)
+
+    처음 받을 때 응답의 ETag(없으면 Last-Modified)를 '<part 파일>.validator'에 기록해 두고,
+    재개할 때 If-Range로 보내서 서버의 파일이 바뀌었으면 처음부터 다시 받는다.
+    validator가 없는 part 파일은 어떤 파일의 일부인지 알 수 없으므로 버린다.
+    """
+    request_headers = kwargs.pop("headers", None) or {}
+    headers = dict(request_headers)
+    validator_path = f"{part_path}.validator"
+    validator = None
+    if os.path.isfile(validator_path):
+        with open(validator_path, encoding="utf-8") as f:
+            validator = f.read() or None
+    if validator is None:
+        _remove_part(part_path)
+
+    offset = os.path.getsize(part_path) if os.path.isfile(part_path) else 0
+    if offset > 0:
+        headers["Range"] = f"bytes={offset}-"
+        headers["If-Range"] = validator
+
+    with session.request(
+        method, url, headers=headers, timeout=timeout, stream=True, **kwargs
+    ) as response:
+        # 304: 조건부 요청에서 파일이 바뀌지 않은 경우, 416: 이미 모든 데이터를 받은 경우
+        if response.status_code in (304, 416):
+            return response.status_code, response.headers
+        response.raise_for_status()
+
+        # If-Range를 무시하고 바뀐 파일의 일부를 보낸 경우 처음부터 다시 받기
+        changed = _get_validator(response.headers) not in (None, validator)
+        if response.status_code == 206 and changed:
+            response.close()
+            _remove_part(part_path)
+            return _request_to_part(
+                session,
+                method,
+                url,
+                part_path,
+                timeout,
+                headers=request_headers,
+                **kwargs,
+            )
+
+        # 서버가 Range 요청을 지원하지 않거나 파일이 바뀌었으면(200) 처음부터 다시 받기
+        if response.status_code == 206:
+            mode = "ab"
+        else:
+            mode = "wb"
+            with open(validator_path, "w", encoding="utf-8") as f:
+                f.write(_get_validator(response.headers) or "")
+        with open(part_path, mode) as f:
+            for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                f.write(chunk)
+        return response.status_code, response.headers
+
+
+def download_file(
+    url,
+    save_path,
+    method="post",
+    session=None,
+    timeout=DEFAULT_TIMEOUT,
+    max_retries=DEFAULT_MAX_RETRIES,
+    backoff=DEFAULT_BACKOFF,
+    sha256=None,
+    **kwargs,
+):
+    """url의 파일을 save_path에 스트리밍으로 저장하기
+
+    다운로드 중에는 '<save_path>.part'에 저장하고, 실패하면 지수적으로 대기 시간을 늘려가며
+    이어받기를 재시도한다. sha256이 주어지면 다운로드 완료 후 해시를 검증한다.
+    kwargs(data, headers 등)는 requests에 그대로 전달된다.
+    조건부 요청(If-None-Match 등)에 서버가 304로 응답하면 기존 파일을 그대로 둔다.
+
+    Returns:
+        {"path": 저장 경로, "size": 파일 크기, "sha256": 파일 해시 (304이면 None),
+         "headers": 응답 헤더, "not_modified": 304 응답 여부}
+    """
+    session = get_session(pool_size=1) if session is None else session
+    part_path = f"{save_path}.part"
+
+    for attempt in range(max_retries + 1):
+        try:
+            status, headers = _request_to_part(
+                session, method, url, part_path, timeout, **kwargs
+            )
+            break
+        except rq.RequestException as e:
+            # 서버 오류(5xx, 429)와 연결 끊김, timeout만 재시도
+            status = getattr(e.response, "status_code", None)
+            retryable = status is None or status >= 500 or status == 429
+            if attempt == max_retries or not retryable:
+                raise
+            wait = backoff * 2**attempt
+            LOGGER.info(f"다운로드 재시도 ({attempt + 1}/{max_retries}) - {wait}초 후: {e}")
+            time.sleep(wait)
+
+    if status == 304:
+        return {
+            "path": save_path,
+            "size": os.path.getsize(save_path),
+            "sha256": None,
+            "headers": dict(headers),
+            "not_modified": True,
+        }
+
+    digest = file_sha256(part_path)
+    if sha256 is not None and digest != sha256:
+        _remove_part(part_path)
+        raise Exception(f'해시 불일치: "{save_path}" ({digest} != {sha256})')
+    os.replace(part_path, save_path)
+    _remove_part(part_path)
+
+    return {
+        "path": save_path,
+        "size": os.path.getsize(save_path),
+        "sha256": digest,
+        "headers": dict(headers),
+        "not_modified": False,
+    }
+
+
+def download_many(jobs, max_workers=DEFAULT_MAX_WORKERS, session=None):
+    """여러 파일을 동시에 다운로드하기
+
+    Args:
+        jobs: {key: download_file()의 인자 dict} 형태
+    Returns:
+        {key: download_file()의 결과 또는 발생한 Exception}
+    """
+    session = get_session(pool_size=max_workers) if session is None else session
+
+    def _download(job):
+        return download_file(session=session, **job)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {key: executor.submit(_download, job) for key, job in jobs.items()}
+
+    results = {}
+    for key, future in futures.items():
+        try:
+            results[key] = future.result()
+        except Exception as e:
+            results[key] = e
+        else:
+            if not results[key]["not_modified"]:
+                utils.add_metric("bytes_downloaded", results[key]["size"])
+    return results
@@ -0,0 +1,213 @@
+import contextlib
+import datetime
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    import msvcrt
+
+    fcntl = None
+
+import utils
+
+LOGGER = utils.set_logger()
+
+# 같은 프로세스의 thread끼리는 MANIFEST_LOCK, 프로세스끼리는 lock 파일로 manifest 갱신을 보호
+# (Unix는 flock, Windows는 msvcrt.locking)
+MANIFEST_LOCK = threading.Lock()
+
+
+def get_manifest_path():
+    """수집 기록(manifest) 파일 경로 가져오기"""
+    return utils.check_path("manifest.json")
+
+
+def load_manifest():
+    """수집 기록 불러오기
+
+    Returns:
+        {dataset: {key: {"month", "path", "size", "etag", "last_modified", "sha256",
+                         "extract_path", "processed_sha256", "updated_at"}}}
+    """
+    manifest_path = get_manifest_path()
+    if not os.path.isfile(manifest_path):
+        return {}
+    return utils.load_data(manifest_path)
+
+
+def save_manifest(manifest):
+    """수집 기록 저장하기 (save_data가 임시 파일에 쓴 뒤 교체)"""
+    utils.save_data(get_manifest_path(), manifest)
+
+
+@contextlib.contextmanager
+def lock_manifest():
+    """manifest를 읽고-고치고-저장하는 동안 다른 thread, 프로세스가 갱신하지 못하게 잠그기"""
+    with MANIFEST_LOCK:
+        with open(get_manifest_path() + ".lock", "a") as lock_file:
+            _lock_file(lock_file)
+            try:
+                yield
+            finally:
+                _unlock_file(lock_file)
+
+
+def _lock_file(lock_file):
+    """다른 프로세스가 잠근 경우 풀릴 때까지 기다렸다가 파일 잠그기"""
+    if fcntl is not None:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        return
+    # msvcrt.locking은 파일의 현재 위치부터 잠그므로, 항상 첫 1 byte를 잠근다
+    while True:
+        lock_file.seek(0)
+        try:
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+            return
+        except OSError:
+            time.sleep(0.05)
+
+
+def _unlock_file(lock_file):
+    """_lock_file()로 잠근 파일 풀기"""
+    if fcntl is not None:
+        fcntl.flock(lock_file, fcntl.LOCK_UN)
+        return
+    lock_file.seek(0)
+    msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def get_entry(dataset, key):
+    """수집 기록에서 (dataset, key)에 해당하는 항목 가져오기"""
+    return load_manifest().get(dataset, {}).get(key)
+
+
+def update_entry(dataset, key, **fields):
+    """수집 기록의 (dataset, key) 항목 갱신하기"""
+    with lock_manifest():
+        manifest = load_manifest()
+        entry = manifest.setdefault(dataset, {}).setdefault(key, {})
+        entry.update(fields)
+        entry["updated_at"] = datetime.datetime.now().isoformat(timespec="seconds")
+        save_manifest(manifest)
+    return entry
+
+
+def is_processed(dataset, key, version=None):
+    """수집된 파일이 마지막으로 처리된 이후 바뀌지 않았는지 확인하기
+
+    version(예: 행정동 코드 변경 규칙의 해시)이 주어지면, 처리할 때의 version과도 비교한다.
+    """
+    entry = get_entry(dataset, key)
+    if entry is None:
+        return False
+    if version is not None and entry.get("processed_version") != version:
+        return False
+    return entry.get("sha256") is not None and (
+        entry.get("processed_sha256") == entry.get("sha256")
+    )
+
+
+def mark_processed(dataset, key, version=None):
+    """수집된 파일을 처리 완료로 기록하기"""
+    entry = get_entry(dataset, key)
+    if entry is not None:
+        update_entry(
+            dataset,
+            key,
+            processed_sha256=entry.get("sha256"),
+            processed_version=version,
+        )
+
+
+def recent_year_months(n, today=None):
+    """오늘을 기준으로 최근 n개월의 년월(YYYYMM) 리스트 만들기 (최신 순)"""
+    today = datetime.date.today() if today is None else today
+    year_months = []
+    for x in range(n):
+        year, month = divmod(today.year * 12 + today.month - 1 - x, 12)
+        year_months.append(f"{year}{str(month + 1).zfill(2)}")
+    return year_months
+
+
+def conditional_headers(entry):
+    """이전 응답의 ETag, Last-Modified를 이용하여 조건부 요청 헤더 만들기"""
+    headers = {}
+    if entry is None or not os.path.isfile(entry.get("path", "")):
+        return headers
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+def fetch_with_manifest(
+    dataset,
+    jobs,
+    revalidate=(),
+    validate=None,
+    max_workers=None,
+):
+    """수집 기록을 참고하여 새로 받아야 하는 파일만 다운로드하기
+
+    이미 받은 key는 건너뛰고, revalidate에 포함된 key는 조건부 요청으로 바뀐 경우에만 받는다.
+    validate(path)가 False를 반환하는 파일은 삭제하고 기록하지 않는다.
+
+    Args:
+        jobs: {key: utils_download.download_file()의 인자 dict}
+        max_workers: 동시 다운로드 개수 (없으면 utils_download.DEFAULT_MAX_WORKERS)
+    Returns:
+        {key: {"path": 파일 경로, "changed": 이전 기록과 내용이 다른지 여부}}
+        (다운로드에 실패한 key는 포함되지 않음)
+    """
+    # 처리 단계에서는 requests를 불러오지 않도록, 다운로드할 때만 import
+    import utils_download
+
+    if max_workers is None:
+        max_workers = utils_download.DEFAULT_MAX_WORKERS
+    manifest = load_manifest().get(dataset, {})
+
+    fetch_jobs = {}
+    outputs = {}
+    for key, job in jobs.items():
+        entry = manifest.get(key)
+        has_file = entry is not None and os.path.isfile(entry.get("path", ""))
+        if has_file and key not in revalidate:
+            outputs[key] = {"path": entry["path"], "changed": False}
+            continue
+        job = dict(job)
+        job["headers"] = {**job.get("headers", {}), **conditional_headers(entry)}
+        fetch_jobs[key] = job
+    if len(outputs) > 0:
+        LOGGER.info(f"데이터 다운로드 생략 (변경 없음) - {sorted(outputs)}")
+
+    results = utils_download.download_many(fetch_jobs, max_workers=max_workers)
+    for key, result in results.items():
+        if isinstance(result, Exception):
+            LOGGER.info(f"데이터 다운로드 실패 - {key}: {result}")
+            continue
+        if result["not_modified"]:
+            outputs[key] = {"path": result["path"], "changed": False}
+            continue
+        if validate is not None and not validate(result["path"]):
+            LOGGER.info(f"데이터 다운로드 실패 (잘못된 파일) - {key}")
+            os.remove(result["path"])
+            continue
+
+        entry = manifest.get(key) or {}
+        changed = entry.get("sha256") != result["sha256"]
+        update_entry(
+            dataset,
+            key,
+            month=key if key.isdigit() else None,
+            path=result["path"],
+            size=result["size"],
+            etag=result["headers"].get("ETag"),
+            last_modified=result["headers"].get("Last-Modified"),
+            sha256=result["sha256"],
+        )
+        outputs[key] = {"path": result["path"], "changed": changed}
+    return outputs
@@ -0,0 +1,191 @@
+import hashlib
+import os
+import shutil
+
+import pyarrow as pa
+import pyarrow.acero as ac
+import pyarrow.dataset as ds
+
+import utils
+
+# 생활인구 데이터 저장소의 파티션 구조: <년월>/<자치구>
+LP_PARTITIONING = ds.partitioning(
+    pa.schema([("year_month", pa.string()), ("gu", pa.string())]),
+    flavor="hive",
+)
+
+
+def get_living_population_store_path():
+    """생활인구 데이터 저장소(Parquet) 경로 가져오기"""
+    return utils.check_path("생활인구", "생활인구_데이터_store")
+
+
+def add_partition_columns(df):
+    """생활인구 데이터에 파티션 column (year_month, gu) 추가하기"""
+    df = df.copy()
+    df["year_month"] = (df["date"] // 100).astype(str)
+    df["gu"] = df["dong_name"].str.split().str[1].fillna("기타")
+    return df
+
+
+def clear_living_population_partition(year_month, store_path=None):
+    """특정 년월의 생활인구 파티션 삭제하기 (재처리 전 호출)"""
+    if store_path is None:
+        store_path = get_living_population_store_path()
+    partition_path = os.path.join(store_path, f"year_month={year_month}")
+    if os.path.isdir(partition_path):
+        shutil.rmtree(partition_path)
+
+
+def list_living_population_partitions(store_path=None):
+    """저장소의 년월 파티션과, 파티션 파일들의 지문(이름, 크기, 수정 시각의 해시) 가져오기
+
+    Returns:
+        {년월(YYYYMM): 지문} (년월 순)
+    """
+    if store_path is None:
+        store_path = get_living_population_store_path()
+    if not os.path.isdir(store_path):
+        return {}
+
+    partitions = {}
+    for dir_name in sorted(os.listdir(store_path)):
+        if not dir_name.startswith("year_month="):
+            continue
+        partition_path = os.path.join(store_path, dir_name)
+        sha256 = hashlib.sha256()
+        for root, _, file_names in sorted(os.walk(partition_path)):
+            for file_name in sorted(file_names):
+                stat = os.stat(os.path.join(root, file_name))
+                rel_path = os.path.relpath(
+                    os.path.join(root, file_name), partition_path
+                )
+                sha256.update(f"{rel_path}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+        partitions[dir_name.split("=", 1)[1]] = sha256.hexdigest()
+    return partitions
+
+
+def write_living_population(df, part_name, store_path=None):
+    """생활인구 데이터를 (년월, 자치구) 단위로 나누어 Parquet 파일로 저장하기
+
+    같은 파티션에 여러 chunk를 쓸 수 있도록, 파일 이름은 part_name으로 구분한다.
+    """
+    if store_path is None:
+        store_path = get_living_population_store_path()
+    df = add_partition_columns(df)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    ds.write_dataset(
+        table,
+        store_path,
+        format="parquet",
+        partitioning=LP_PARTITIONING,
+        basename_template=f"{part_name}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+    )
+
+
+def get_living_population_dataset(store_path=None):
+    """생활인구 데이터 저장소를 pyarrow dataset으로 열기"""
+    if store_path is None:
+        store_path = get_living_population_store_path()
+    if not os.path.isdir(store_path):
+        raise Exception(f'저장소 없음: "{store_path}"')
+    return ds.dataset(store_path, format="parquet", partitioning=LP_PARTITIONING)
+
+
+def _get_partition_filter(year_month, gu=None):
+    """년월 파티션 하나(gu를 지정하면 그 자치구만)를 고르는 filter"""
+    partition_filter = ds.field("year_month") == str(year_month)
+    if gu is not None:
+        gu = [gu] if isinstance(gu, str) else list(gu)
+        partition_filter = partition_filter & ds.field("gu").isin(gu)
+    return partition_filter
+
+
+def count_living_population(year_month, gu=None, store_path=None):
+    """저장소의 년월 파티션 하나의 row 수 (parquet metadata만 읽음)"""
+    dataset = get_living_population_dataset(store_path)
+    return dataset.count_rows(filter=_get_partition_filter(year_month, gu))
+
+
+def sum_living_population(year_month, keys, columns, gu=None, store_path=None):
+    """저장소의 년월 파티션 하나를 keys별로 합산하기 (pyarrow Acero, out-of-core)
+
+    파티션 전체를 메모리에 올리지 않고, 파일을 batch 단위로 읽으면서 여러 thread로 합산한다.
+    합계는 float64로 계산하며, 결과는 keys 순으로 정렬한다. (pandas groupby와 같은 순서)
+    gu(자치구 이름 또는 리스트)를 지정하면 해당 자치구만 합산한다.
+
+    Returns:
+        keys + columns column을 가진 DataFrame (문자열 key는 string, 나머지 key는 저장소의 형식)
+    """
+    dataset = get_living_population_dataset(store_path)
+    partition_filter = _get_partition_filter(year_month, gu)
+    row_filter = partition_filter
+    for key in keys:
+        row_filter = row_filter & ds.field(key).is_valid()
+    declaration = ac.Declaration.from_sequence(
+        [
+            ac.Declaration(
+                "scan",
+                ac.ScanNodeOptions(
+                    dataset, columns=keys + columns, filter=partition_filter
+                ),
+            ),
+            # pandas groupby처럼 key가 비어 있는 row는 제외
+            ac.Declaration("filter", ac.FilterNodeOptions(row_filter)),
+            ac.Declaration(
+                "project",
+                ac.ProjectNodeOptions(
+                    [ds.field(key) for key in keys]
+                    + [ds.field(column).cast(pa.float64()) for column in columns],
+                    names=keys + columns,
+                ),
+            ),
+            ac.Declaration(
+                "aggregate",
+                ac.AggregateNodeOptions(
+                    [(column, "hash_sum", None, column) for column in columns],
+                    keys=keys,
+                ),
+            ),
+        ]
+    )
+    table = declaration.to_table(use_threads=True)
+    table = table.select(keys + columns).sort_by([(key, "ascending") for key in keys])
+    key_types = []
+    for key in keys:
+        key_type = dataset.schema.field(key).type
+        if pa.types.is_large_string(key_type) or pa.types.is_dictionary(key_type):
+            key_type = pa.string()
+        key_types.append((key, key_type))
+    return table.cast(
+        pa.schema(key_types + [(c, pa.float64()) for c in columns])
+    ).to_pandas()
+
+
+def read_living_population(
+    gu=None, start=None, end=None, columns=None, store_path=None
+):
+    """저장소에서 생활인구 데이터 불러오기
+
+    gu(자치구 이름 또는 리스트), start/end(년월, 예: "202301")로 조건을 주면
+    해당 파티션의 파일만 읽는다. 예) 2023년 1분기 → start="202301", end="202303"
+    """
+    dataset = get_living_population_dataset(store_path)
+    conditions = []
+    if gu is not None:
+        gu = [gu] if isinstance(gu, str) else list(gu)
+        conditions.append(ds.field("gu").isin(gu))
+    if start is not None:
+        conditions.append(ds.field("year_month") >= str(start))
+    if end is not None:
+        conditions.append(ds.field("year_month") <= str(end))
+    dataset_filter = None
+    for condition in conditions:
+        if dataset_filter is None:
+            dataset_filter = condition
+        else:
+            dataset_filter = dataset_filter & condition
+
+    table = dataset.to_table(columns=columns, filter=dataset_filter)
+    return table.to_pandas()
@@ -1,81 +1,251 @@
+import contextlib
+import functools
 import glob
 import json
-import logging
 import os
-import sys
+import re
 import time
+from concurrent.futures import ProcessPoolExecutor
 
 import folium
 import geopandas as gpd
 import numpy as np
-import pandas as pd
-import requests
-from selenium import webdriver
-from selenium.common.exceptions import NoSuchElementException
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import Select
-from tqdm import tqdm
-from webdriver_manager.chrome import ChromeDriverManager
+import shapely
 
 import utils
+import utils_cache
 
 LOGGER = utils.set_logger()
 
+# 행정동 경계 단순화 단계 (단위: 경위도)
+GEO_SIMPLIFY_TOLERANCES = (0, 0.0001, 0.0005)
 
-def process_geo_data():
-    """시각화에 필요한 geo 데이터 처리하기"""
-    file_path = os.path.join(utils.check_path("행정동"), "*.json")
-    file_path_list = glob.glob(file_path)
-    file_path = [f for f in file_path_list if "경계" in f][0]
+# 스크린샷에 사용하는 Chrome (browser_session() 안에서 get_browser()로 가져오기)
+BROWSER = None
+BROWSER_WINDOW_SIZE = "1280,1024"
+BROWSER_TIMEOUT = 30
 
+# matplotlib 지도에 사용할 한글 글꼴 (설치된 것 중 앞의 것을 사용)
+KOREAN_FONTS = (
+    "NanumGothic",
+    "Malgun Gothic",
+    "AppleGothic",
+    "Noto Sans CJK KR",
+    "Noto Sans KR",
+)
+
+
+def get_latest_boundary_path():
+    """가장 최신 버전의 행정동 경계 데이터 경로와 버전 가져오기"""
+    file_path = os.path.join(utils.check_path("행정동"), "행정동_경계_v*.json")
+    file_path = sorted(glob.glob(file_path))[-1]
+    version = re.search(r"v(\d{4}-\d{2}-\d{2})", file_path).group(1)
+    return file_path, version
+
+
+def build_geo_cache(file_path, version):
+    """서울시 행정동 경계만 골라, 단순화 단계별로 GeoParquet 파일에 저장하기
+
+    행정동끼리 맞닿은 경계가 어긋나지 않도록 shapely.coverage_simplify로 단순화한다.
+    """
     geo_df = gpd.read_file(file_path)
-    geo_df = geo_df[["adm_cd8", "geometry"]]
-    geo_df.columns = ["dong_code", "geometry"]
+    geo_df = geo_df[geo_df["sidonm"] == "서울특별시"]
+    geo_df = geo_df[["adm_cd8", "adm_nm", "geometry"]].reset_index(drop=True)
+
+    for tolerance in GEO_SIMPLIFY_TOLERANCES:
+        simple_df = geo_df.copy()
+        if tolerance > 0:
+            simple_df["geometry"] = shapely.coverage_simplify(
+                geo_df.geometry.values, tolerance
+            )
+        cache_path = get_geo_cache_path(version, tolerance)
+        simple_df.to_parquet(cache_path)
+        LOGGER.info(f"행정동 경계 캐시 저장 완료 - {os.path.basename(cache_path)}")
+
+
+def get_geo_cache_path(version, tolerance):
+    """행정동 경계 캐시 파일 경로 가져오기"""
+    return utils.check_path(
+        "행정동", "cache", f"행정동_경계_v{version}_서울_t{tolerance}.parquet"
+    )
+
+
+@utils_cache.cached(inputs=["행정동/행정동_경계_v*.json"])
+def process_geo_data(tolerance=0.0001):
+    """시각화에 필요한 geo 데이터 처리하기
 
-    geo_json = utils.load_data(file_path)
-    geo_json["features"] = [
-        i for i in geo_json["features"] if i["properties"]["sidonm"] == "서울특별시"
-    ]
+    서울시 경계만 단순화하여 저장해 둔 캐시(GeoParquet)를 읽고, 캐시가 없으면 새로 만든다.
+    tolerance는 GEO_SIMPLIFY_TOLERANCES 중 하나 (0이면 원본 경계)
+    경계 파일이 그대로이면 GeoJSON 변환 결과까지 저장해 둔 것을 사용한다. (utils_cache)
+    """
+    if tolerance not in GEO_SIMPLIFY_TOLERANCES:
+        raise Exception(f"지원하지 않는 단순화 단계: {tolerance}")
+
+    file_path, version = get_latest_boundary_path()
+    cache_path = get_geo_cache_path(version, tolerance)
+    if not os.path.isfile(cache_path):
+        build_geo_cache(file_path, version)
+    seoul_df = gpd.read_parquet(cache_path)
+
+    geo_json = json.loads(seoul_df.to_json(drop_id=True))
+
+    geo_df = seoul_df[["adm_cd8", "geometry"]]
+    geo_df.columns = ["dong_code", "geometry"]
 
     return geo_df, geo_json
 
 
-def save_folium_image(folium_map, file_name_no_ext):
-    """folium으로 시각화 한 파일 저장하기"""
-    # html_title = f'<h2 style="text-align: center;">{file_name_no_ext}</h2>'
-    # folium_map.get_root().html.add_child(folium.Element(html_title))
+def get_browser():
+    """스크린샷에 사용할 headless Chrome 가져오기 (한 번 실행한 브라우저를 계속 재사용)"""
+    global BROWSER
+    if BROWSER is None:
+        # 브라우저 관련 모듈은 import가 느리므로, 브라우저가 필요할 때만 불러온다
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+        from webdriver_manager.chrome import ChromeDriverManager
+
+        options = webdriver.ChromeOptions()
+        options.add_argument("--headless=new")
+        options.add_argument(f"--window-size={BROWSER_WINDOW_SIZE}")
+        BROWSER = webdriver.Chrome(
+            service=Service(ChromeDriverManager().install()),
+            options=options,
+        )
+    return BROWSER
+
+
+def close_browser():
+    """재사용 중인 Chrome 종료하기"""
+    global BROWSER
+    if BROWSER is not None:
+        BROWSER.quit()
+        BROWSER = None
+
 
+@contextlib.contextmanager
+def browser_session():
+    """블록 안에서 Chrome을 재사용하고, 블록이 끝나면 종료하기
+
+    이미 열린 session 안에서 다시 사용하면 바깥 session이 끝날 때 종료한다.
+    (atexit은 process pool의 worker에서 실행되지 않으므로, 브라우저는 반드시 이 블록으로 닫는다)
+
+    예)
+        with utils_vis.browser_session():
+            for ...:
+                utils_vis.save_folium_image(...)
+    """
+    owner = BROWSER is None
+    try:
+        yield get_browser()
+    finally:
+        if owner:
+            close_browser()
+
+
+def is_folium_map_ready(browser):
+    """folium 지도의 페이지 로딩과 지도 타일 요청이 모두 끝났는지 확인하기
+
+    타일 이미지는 불러오기에 실패해도 complete가 되므로, 실패한 타일 때문에 기다리지 않는다.
+    """
+    return browser.execute_script(
+        """
+        return document.readyState === "complete"
+            && document.querySelector(".leaflet-container") !== null
+            && Array.from(document.querySelectorAll("img.leaflet-tile"))
+                .every((img) => img.complete);
+        """
+    )
+
+
+def save_folium_html(folium_map, file_name_no_ext):
+    """folium으로 시각화 한 지도를 html 파일로 저장하기"""
     html_dir = os.path.join(os.path.abspath("."), "report", "vis_html")
     if not os.path.exists(html_dir):
         os.makedirs(html_dir)
     html_path = os.path.join(html_dir, f"{file_name_no_ext}.html")
     folium_map.save(html_path)
+    return html_path
+
+
+def save_folium_image(folium_map, file_name_no_ext):
+    """folium으로 시각화 한 파일 저장하기"""
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    # html_title = f'<h2 style="text-align: center;">{file_name_no_ext}</h2>'
+    # folium_map.get_root().html.add_child(folium.Element(html_title))
+
+    html_path = save_folium_html(folium_map, file_name_no_ext)
 
     url = f"file://{html_path}"
-    browser = webdriver.Chrome(
-        service=Service(ChromeDriverManager().install()),
-        options=webdriver.ChromeOptions(),
-    )
-    browser.get(url)
-    time.sleep(1)
     image_path = utils.check_path("시각화", f"{file_name_no_ext}.png")
-    browser.save_screenshot(image_path)
-    browser.close()
+    with browser_session() as browser:
+        browser.get(url)
+        try:
+            WebDriverWait(browser, BROWSER_TIMEOUT).until(is_folium_map_ready)
+        except TimeoutException:
+            LOGGER.warning(
+                f"지도 로딩 대기 시간 초과 ({BROWSER_TIMEOUT}초) - 현재 화면으로 저장: {file_name_no_ext}"
+            )
+        browser.save_screenshot(image_path)
     LOGGER.info(f"folium 이미지 저장 완료 - {file_name_no_ext}.png")
 
 
-def visualize_by_dong(df, columns, aliases_columns, legend_name):
-    """folium으로 행정동 시각화하기"""
-    null_df = df.replace(0, np.NaN)
+@functools.lru_cache(maxsize=None)
+def get_korean_font():
+    """설치된 한글 글꼴 이름 찾기 (없으면 경고하고 None)"""
+    from matplotlib import font_manager
+
+    installed = {font.name for font in font_manager.fontManager.ttflist}
+    for name in KOREAN_FONTS:
+        if name in installed:
+            return name
+    fonts = ", ".join(KOREAN_FONTS)
+    LOGGER.warning(f"한글 글꼴 없음 ({fonts} 중 하나 필요) - 지도의 한글이 깨질 수 있음")
+    return None
+
+
+def save_static_image(geo_df, column, file_name_no_ext, ext="png"):
+    """브라우저 없이 geopandas(matplotlib)로 행정동 지도를 그려서 저장하기 (png, svg 등)"""
+    import matplotlib
+    from matplotlib.figure import Figure
+
+    # 범례 이름이 한글이므로 한글 글꼴을 쓰고, 없는 글자는 기본 글꼴(DejaVu Sans)로 그림
+    font = get_korean_font()
+    rc = {
+        "font.family": [font, "DejaVu Sans"] if font else ["DejaVu Sans"],
+        "axes.unicode_minus": False,
+    }
+    with matplotlib.rc_context(rc):
+        fig = Figure(figsize=(12, 9))
+        ax = fig.add_subplot()
+        geo_df.plot(
+            column=column,
+            ax=ax,
+            cmap="YlOrRd",
+            alpha=0.6,
+            edgecolor="black",
+            linewidth=0.3,
+            legend=True,
+            legend_kwds={"label": file_name_no_ext, "shrink": 0.6},
+            missing_kwds={"color": "white", "edgecolor": "black", "linewidth": 0.3},
+        )
+        ax.set_axis_off()
+
+        image_path = utils.check_path("시각화", f"{file_name_no_ext}.{ext}")
+        fig.savefig(image_path, dpi=150, bbox_inches="tight")
+    LOGGER.info(f"지도 이미지 저장 완료 - {file_name_no_ext}.{ext}")
 
-    geo_df, geo_json = process_geo_data()
-    df = geo_df.merge(df, on="dong_code")
 
-    seoul_map = folium.Map(
+def make_seoul_map():
+    """서울시 중심의 folium 지도 만들기"""
+    return folium.Map(
         location=[37.5726, 126.9740], zoom_start=11, tiles="cartodbpositron"
     )
 
+
+def add_choropleth(folium_map, geo_json, null_df, columns, legend_name, show=True):
+    """행정동별 값을 색으로 나타내는 단계구분도 레이어 추가하기"""
     folium.Choropleth(
         geo_data=geo_json,
         data=null_df,
@@ -88,11 +258,15 @@ def visualize_by_dong(df, columns, aliases_columns, legend_name):
         nan_fill_opacity=0.6,
         highlight=True,
         legend_name=legend_name,
-    ).add_to(seoul_map)
+        name=legend_name,
+        show=show,
+    ).add_to(folium_map)
+
 
-    columns[0] = "dong_name"
+def add_tooltip(folium_map, geo_df, fields, aliases):
+    """행정동 경계선과, 마우스를 올리면 값을 보여주는 tooltip 레이어 추가하기"""
     folium.features.GeoJson(
-        data=df,
+        data=geo_df,
         smooth_factor=2,
         style_function=lambda x: {
             "color": "black",
@@ -100,8 +274,8 @@ def visualize_by_dong(df, columns, aliases_columns, legend_name):
             "weight": 0.5,
         },
         tooltip=folium.features.GeoJsonTooltip(
-            fields=columns,
-            aliases=aliases_columns,
+            fields=fields,
+            aliases=aliases,
             localize=True,
             sticky=False,
             labels=True,
@@ -114,6 +288,311 @@ def visualize_by_dong(df, columns, aliases_columns, legend_name):
             max_width=800,
         ),
         highlight_function=lambda x: {"weight": 3, "fillColor": "grey"},
-    ).add_to(seoul_map)
+        name="행정동",
+        control=False,
+    ).add_to(folium_map)
+
+
+def visualize_by_dong(
+    df, columns, aliases_columns, legend_name, backend="browser", geo_data=None
+):
+    """folium으로 행정동 시각화하기
+
+    지도 이미지는 backend="browser"이면 Chrome 스크린샷으로, backend="static"이면
+    브라우저 없이 matplotlib으로 저장한다.
+    geo_data에 process_geo_data()의 결과를 넘기면 경계 데이터를 다시 읽지 않는다.
+    """
+    null_df = df.replace(0, np.nan)
+
+    geo_df, geo_json = process_geo_data() if geo_data is None else geo_data
+    df = geo_df.merge(df, on="dong_code")
+
+    seoul_map = make_seoul_map()
+    add_choropleth(seoul_map, geo_json, null_df, columns, legend_name)
+    add_tooltip(seoul_map, df, ["dong_name"] + columns[1:], aliases_columns)
+
+    if backend == "browser":
+        save_folium_image(folium_map=seoul_map, file_name_no_ext=legend_name)
+    elif backend == "static":
+        save_folium_html(folium_map=seoul_map, file_name_no_ext=legend_name)
+        static_df = geo_df.merge(null_df, on="dong_code", how="left")
+        save_static_image(static_df, column=columns[1], file_name_no_ext=legend_name)
+    else:
+        raise Exception(f"지원하지 않는 이미지 저장 방식: {backend}")
+
+
+def _visualize_by_dong_timed(jobs):
+    """visualize_by_dong()을 차례로 실행하고 지도별 걸린 시간(초) 반환하기 (process pool용)
+
+    worker 하나가 맡은 지도는 Chrome 하나를 재사용하여 저장하고, 끝나면 Chrome을 종료한다.
+    """
+    timings = {}
+    use_browser = any(kwargs["backend"] == "browser" for kwargs in jobs.values())
+    with browser_session() if use_browser else contextlib.nullcontext():
+        for legend_name, kwargs in jobs.items():
+            start = time.perf_counter()
+            visualize_by_dong(**kwargs)
+            timings[legend_name] = time.perf_counter() - start
+    return timings
+
+
+def visualize_many_by_dong(
+    df,
+    value_columns,
+    aliases,
+    legend_names,
+    mode="files",
+    file_name_no_ext=None,
+    backend="static",
+    max_workers=None,
+):
+    """여러 값(column)을 한 번에 행정동 지도로 시각화하기
+
+    경계 데이터는 한 번만 읽어서 모든 지도에 함께 사용한다.
+    - mode="layers": 값마다 켜고 끌 수 있는 레이어로 만들어 html 1개(file_name_no_ext)에 저장
+    - mode="files": 값마다 지도(html, 이미지)를 따로 만들고, max_workers개의 프로세스로 동시에 저장
+
+    Args:
+        df: "dong_code", "dong_name"과 value_columns를 포함한 DataFrame
+        aliases: tooltip에 보여줄 value_columns의 이름
+        legend_names: 지도별 범례 이름 (mode="files"이면 파일 이름으로도 사용)
+    Returns:
+        mode="files"이면 {legend_name: 지도 1개를 만드는 데 걸린 시간(초)},
+        mode="layers"이면 {file_name_no_ext: 모든 레이어를 html로 저장하기까지 걸린 시간(초)}
+    """
+    geo_data = process_geo_data()
+    geo_df, geo_json = geo_data
+    timings = {}
+
+    if mode == "layers":
+        # 레이어는 html 하나로 함께 저장되므로, 저장까지 전체 시간을 잰다
+        start = time.perf_counter()
+        null_df = df.replace(0, np.nan)
+        merged_df = geo_df.merge(df, on="dong_code")
+
+        seoul_map = make_seoul_map()
+        for i, (column, legend_name) in enumerate(zip(value_columns, legend_names)):
+            add_choropleth(
+                seoul_map,
+                geo_json,
+                null_df,
+                ["dong_code", column],
+                legend_name,
+                show=i == 0,
+            )
+        add_tooltip(
+            seoul_map,
+            merged_df,
+            ["dong_name"] + list(value_columns),
+            ["행정동:"] + list(aliases),
+        )
+        folium.LayerControl(collapsed=False).add_to(seoul_map)
+        save_folium_html(folium_map=seoul_map, file_name_no_ext=file_name_no_ext)
+        timings[file_name_no_ext] = time.perf_counter() - start
+    elif mode == "files":
+        jobs = {}
+        for column, alias, legend_name in zip(value_columns, aliases, legend_names):
+            jobs[legend_name] = {
+                "df": df[["dong_code", "dong_name", column]],
+                "columns": ["dong_code", column],
+                "aliases_columns": ["행정동:", alias],
+                "legend_name": legend_name,
+                "backend": backend,
+                "geo_data": geo_data,
+            }
+        # worker마다 맡을 지도를 나누어, 브라우저를 worker당 한 번만 실행
+        n_workers = max(1, min(len(jobs), max_workers or os.cpu_count() or 1))
+        chunks = [{} for _ in range(n_workers)]
+        for i, (legend_name, kwargs) in enumerate(jobs.items()):
+            chunks[i % n_workers][legend_name] = kwargs
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            futures = [executor.submit(_visualize_by_dong_timed, c) for c in chunks]
+        for future in futures:
+            timings.update(future.result())
+        timings = {legend_name: timings[legend_name] for legend_name in jobs}
+    else:
+        raise Exception(f"지원하지 않는 시각화 방식: {mode}")
+
+    for legend_name, seconds in timings.items():
+        LOGGER.info(f"시각화 소요 시간 - {legend_name}: {seconds:.2f}초")
+    return timings
+
+
+def get_report_path(*paths):
+    """보고서(report) 디렉토리 안의 파일 경로 가져오기 (디렉토리가 없으면 생성)"""
+    file_path = os.path.join(os.path.abspath("."), "report", *paths)
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    return file_path
+
+
+def _split_ring(ring, junctions):
+    """양자화한 ring(닫힌 좌표 리스트)을 교차점(junction)에서 잘라 arc 리스트로 만들기"""
+    points = ring[:-1]
+    cuts = [i for i, p in enumerate(points) if p in junctions]
+    if len(cuts) == 0:
+        # 교차점이 없는 ring은 가장 작은 좌표에서 시작하도록 돌려서, 같은 ring을 같은 arc로 만든다
+        start = points.index(min(points))
+        points = points[start:] + points[:start]
+        return [points + [points[0]]]
+    points = points[cuts[0] :] + points[: cuts[0]]
+    cuts = [i - cuts[0] for i in cuts] + [len(points)]
+    points = points + [points[0]]
+    return [points[a : b + 1] for a, b in zip(cuts[:-1], cuts[1:])]
+
+
+def to_topojson(geo_df, id_column, properties=None, quantization=10_000):
+    """(Multi)Polygon GeoDataFrame을 양자화한 TopoJSON으로 바꾸기
+
+    이웃한 행정동이 함께 쓰는 경계는 arc 하나로 한 번만 저장하고, 좌표는 quantization × quantization
+    격자의 정수로 바꾼 뒤 차이(delta)로 저장하므로 GeoJSON보다 훨씬 작다.
+    (shapely.coverage_simplify로 단순화한 경계는 맞닿은 경계의 좌표가 같아서 arc를 공유할 수 있다)
+
+    Args:
+        id_column: feature id로 사용할 column (예: "dong_code")
+        properties: feature마다 함께 저장할 column 리스트
+
+    Returns:
+        TopoJSON dict (object 이름: "dong")
+    """
+    x0, y0, x1, y1 = geo_df.total_bounds
+    kx = (x1 - x0) / (quantization - 1) or 1
+    ky = (y1 - y0) / (quantization - 1) or 1
+
+    # 1. 좌표 양자화 (연속으로 같은 좌표가 된 점은 하나만 남김)
+    def quantize(ring):
+        xy = np.rint((shapely.get_coordinates(ring) - [x0, y0]) / [kx, ky])
+        xy = xy.astype(np.int64)
+        keep = np.r_[True, (np.diff(xy, axis=0) != 0).any(axis=1)]
+        return [tuple(p) for p in xy[keep].tolist()]
+
+    features = []
+    for geometry in geo_df.geometry.values:
+        polygons = []
+        for polygon in getattr(geometry, "geoms", [geometry]):
+            # 양자화 후 면적이 없어진 ring(점 4개 미만)은 버림
+            rings = [quantize(polygon.exterior)]
+            rings += [quantize(interior) for interior in polygon.interiors]
+            if len(rings[0]) >= 4:
+                polygons.append([ring for ring in rings if len(ring) >= 4])
+        features.append(polygons)
+
+    # 2. 교차점 찾기: 이웃한 점의 쌍이 ring마다 다르면 경계가 갈라지는 점
+    neighbors = {}
+    for polygons in features:
+        for rings in polygons:
+            for ring in rings:
+                points = ring[:-1]
+                for i, point in enumerate(points):
+                    pair = frozenset((points[i - 1], points[(i + 1) % len(points)]))
+                    neighbors.setdefault(point, set()).add(pair)
+    junctions = {p for p, pairs in neighbors.items() if len(pairs) > 1}
+
+    # 3. ring을 arc로 나누고, 같은 arc(역방향 포함)는 하나만 저장
+    arcs = []
+    arc_index = {}
+    geometries = []
+    for polygons in features:
+        arc_polygons = []
+        for rings in polygons:
+            arc_rings = []
+            for ring in rings:
+                arc_ring = []
+                for arc in _split_ring(ring, junctions):
+                    key = tuple(arc)
+                    if key in arc_index:
+                        arc_ring.append(arc_index[key])
+                    elif key[::-1] in arc_index:
+                        arc_ring.append(~arc_index[key[::-1]])
+                    else:
+                        arc_index[key] = len(arcs)
+                        arc_ring.append(len(arcs))
+                        arcs.append(arc)
+                arc_rings.append(arc_ring)
+            arc_polygons.append(arc_rings)
+        geometries.append(arc_polygons)
+
+    # 4. arc 좌표를 차이(delta)로 저장
+    delta_arcs = []
+    for arc in arcs:
+        arc = np.array(arc, dtype=np.int64)
+        delta_arcs.append(np.r_[arc[:1], np.diff(arc, axis=0)].tolist())
+
+    # numpy 값(int64, float32 등)은 json으로 저장할 수 없으므로 Python 값으로, 빈 값은 None으로
+    records = [{} for _ in range(len(geo_df))]
+    if properties:
+        property_df = geo_df[properties].astype(object)
+        records = property_df.where(property_df.notna(), None).to_dict("records")
+    topology_geometries = []
+    for i, arc_polygons in enumerate(geometries):
+        topology_geometries.append(
+            {
+                "type": "MultiPolygon",
+                "id": str(geo_df[id_column].iloc[i]),
+                "properties": records[i],
+                "arcs": arc_polygons,
+            }
+        )
+    return {
+        "type": "Topology",
+        "bbox": [float(x0), float(y0), float(x1), float(y1)],
+        "transform": {
+            "scale": [float(kx), float(ky)],
+            "translate": [float(x0), float(y0)],
+        },
+        "objects": {
+            "dong": {"type": "GeometryCollection", "geometries": topology_geometries}
+        },
+        "arcs": delta_arcs,
+    }
+
+
+def save_report_boundary(tolerance=0.0001, quantization=10_000):
+    """보고서 지도에서 함께 쓰는 행정동 경계를 TopoJSON 파일 1개로 저장하기
+
+    Returns:
+        저장한 파일 경로
+    """
+    geo_df, geo_json = process_geo_data(tolerance=tolerance)
+    geo_df = geo_df.assign(
+        dong_name=[f["properties"]["adm_nm"] for f in geo_json["features"]]
+    )
+    topology = to_topojson(
+        geo_df, "dong_code", properties=["dong_name"], quantization=quantization
+    )
+    file_path = get_report_path("data", "행정동_경계.topojson.json")
+    with open(file_path, "w", encoding="utf-8") as f:
+        json.dump(topology, f, ensure_ascii=False, separators=(",", ":"))
+    LOGGER.info(
+        f"보고서 행정동 경계 저장 완료 - {os.path.basename(file_path)} "
+        f"({os.path.getsize(file_path) / 1024:,.0f}KB)"
+    )
+    return file_path
+
+
+def save_report_metric(df, column, legend_name, alias, digits=0):
+    """보고서 지도에 쓰는 지표 하나를 {행정동 코드: 값} JSON 파일로 저장하기
+
+    보고서 페이지(report/map.js)는 이 파일과 행정동 경계(save_report_boundary)를 불러와
+    브라우저에서 합친 뒤 지도로 그린다.
+
+    Args:
+        df: "dong_code"와 column을 포함한 DataFrame
+        legend_name: 지표 이름 (파일 이름, 범례로 사용)
+        alias: tooltip에 보여줄 값의 이름
+        digits: 값의 소수점 자리 수
 
-    save_folium_image(folium_map=seoul_map, file_name_no_ext=legend_name)
+    Returns:
+        저장한 파일 경로
+    """
+    values = df.set_index(df["dong_code"].astype(str))[column].dropna().round(digits)
+    values = values.astype(int) if digits == 0 else values
+    metric = {
+        "name": legend_name,
+        "alias": alias,
+        "values": dict(zip(values.index, values.tolist())),
+    }
+    file_path = get_report_path("data", "metrics", f"{legend_name}.json")
+    with open(file_path, "w", encoding="utf-8") as f:
+        json.dump(metric, f, ensure_ascii=False, separators=(",", ":"))
+    LOGGER.info(f"보고서 지표 저장 완료 - {legend_name}.json")
+    return file_path